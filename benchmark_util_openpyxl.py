@@ -0,0 +1,545 @@
+# Version 10/17/26 Benchmarks for util_openpyxl
+# Usage: python benchmark_util_openpyxl.py [benchmark names] (default runs all)
+#        python benchmark_util_openpyxl.py suite --n-cells 100000 --json results.json 
+#               [--memory] [--profile hot.prof]
+import argparse
+import cProfile
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import openpyxl
+import util_openpyxl as util
+
+"""
+===============================================================================
+Synthetic DataFrames and timing helpers
+===============================================================================
+"""
+
+def make_df(n_cells, n_cols=10, kind='mixed'):
+    """
+    Return a synthetic DataFrame with about n_cells data values
+    kind: 'numeric' (floats), 'mixed' (float, int, string and date columns) or
+          'multiindex' (numeric with 2-level columns in groups of 3)
+    JDL 10/17/26
+    """
+    n_rows = max(n_cells // n_cols, 1)
+    rng = np.random.default_rng(0)
+    d = {}
+    for j in range(n_cols):
+        if kind in ['numeric', 'multiindex'] or j % 4 == 0:
+            d['col' + str(j)] = rng.random(n_rows)
+        elif j % 4 == 1:
+            d['col' + str(j)] = rng.integers(0, 1000, n_rows)
+        elif j % 4 == 2:
+            d['col' + str(j)] = rng.choice(['North', 'South', 'East', 'West'], n_rows)
+        else:
+            d['col' + str(j)] = pd.date_range('2020-01-01', periods=n_rows, freq='h')
+    df = pd.DataFrame(d)
+    if kind == 'multiindex':
+        df.columns = pd.MultiIndex.from_tuples([('grp' + str(j // 3), col) 
+                                                for j, col in enumerate(df.columns)])
+    df.index.name = 'row_id'
+    return df
+
+def time_fn(fn, *args, **kwargs):
+    """
+    Return (elapsed seconds, result) for one call of fn
+    JDL 10/17/26
+    """
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+def peak_mem_fn(fn, *args, **kwargs):
+    """
+    Return (elapsed seconds, peak traced memory in MB) for one call of fn
+    JDL 10/17/26
+    """
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, round(peak / 1e6, 1)
+
+def tmp_xlsx(name):
+    """
+    Return path for a scratch .xlsx file in the temp directory
+    """
+    return os.path.join(tempfile.gettempdir(), 'bench_' + name + '.xlsx')
+
+def print_row(label, *vals):
+    """
+    Print a fixed-width benchmark result row
+    """
+    print(label.ljust(36) + ''.join(str(v).rjust(14) for v in vals))
+
+"""
+===============================================================================
+Legacy per-cell implementations kept as baselines
+===============================================================================
+"""
+
+def legacy_write_dataframe(ws, df, cell_home):
+    """
+    write_dataframe as of 6/18/24 (df.values and list(df.index) per cell)
+    """
+    d_cells = util.set_df_openpyxl_cell_locns(ws, df, cell_home)
+    for i, j, c in util.rng_iterator_enum(ws, d_cells['cell_home_data'], d_cells['cell_end_data']):
+        c.value = df.values[i-1][j-1]
+    for i, j, c in util.rng_iterator_enum(ws, d_cells['cell_home_idx'], d_cells['cell_end_idx']):
+        c.value = list(df.index)[i-1]
+    ws.cell(d_cells['cell_home_idx'].row - 1, d_cells['cell_home_idx'].column).value = df.index.name
+    for i, j, c in util.rng_iterator_enum(ws, d_cells['cell_home_cols'], d_cells['cell_end_cols']):
+        c.value = list(df.columns)[j-1]
+    return ws
+
+"""
+===============================================================================
+Benchmarks
+===============================================================================
+"""
+
+def bench_write_dataframe(lst_n_cells=(10_000, 100_000, 1_000_000), max_legacy_cells=10_000):
+    """
+    Compare bulk write_dataframe with the legacy per-cell path
+    (legacy is skipped above max_legacy_cells since it is quadratic in rows)
+    JDL 10/17/26
+    """
+    print_row('write_dataframe (mixed dtypes)', 'cells', 'legacy s', 'bulk s', 'speedup')
+    for n_cells in lst_n_cells:
+        df = make_df(n_cells)
+        t_legacy = None
+        if n_cells <= max_legacy_cells:
+            ws = openpyxl.Workbook().active
+            t_legacy, _ = time_fn(legacy_write_dataframe, ws, df, ws.cell(2, 2))
+        ws = openpyxl.Workbook().active
+        t_bulk, _ = time_fn(util.write_dataframe, ws, df, ws.cell(2, 2))
+        speedup = round(t_legacy / t_bulk, 1) if t_legacy else '-'
+        print_row('', n_cells, round(t_legacy, 3) if t_legacy else '-', round(t_bulk, 3), speedup)
+
+def legacy_rng_iterator(ws, cell_home, cell_end):
+    """
+    rng_iterator as of 6/18/24 (ws.cell call per coordinate)
+    """
+    for row in range(cell_home.row, cell_end.row + 1):
+        for col in range(cell_home.column, cell_end.column + 1):
+            yield ws.cell(row=row, column=col)
+
+def export_styled_df(sfile, df):
+    """
+    Write and style df on a regular worksheet and save (baseline for write_only)
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    util.write_dataframe(ws, df, ws.cell(2, 2))
+    util.set_df_borders(ws, df, ws.cell(2, 2))
+    util.set_df_builtin_styles(ws, df, ws.cell(2, 2), style_idx='Good', style_cols='Accent1')
+    util.set_range_num_format(ws, ws.cell(2, 2), ws.cell(df.index.size + 1, df.columns.size + 1), '0.00')
+    wb.save(sfile)
+
+def export_styled_df_write_only(sfile, df):
+    """
+    Same styled output as export_styled_df through write_df_write_only
+    """
+    util.write_df_write_only(sfile, df, d_borders={'data':'thin', 'idx':'thin', 'cols':'thick'},
+                             d_styles={'idx':'Good', 'cols':'Accent1'}, d_num_fmts={'data':'0.00'})
+
+def bench_write_only(lst_n_cells=(50_000, 200_000)):
+    """
+    Compare peak memory of styled export on a regular vs write_only workbook
+    JDL 10/17/26
+    """
+    print_row('styled export peak memory', 'cells', 'regular MB', 'write_only MB', 'wo s')
+    for n_cells in lst_n_cells:
+        df = make_df(n_cells, kind='numeric')
+        _, mem_reg = peak_mem_fn(export_styled_df, tmp_xlsx('regular'), df)
+        t_wo, mem_wo = peak_mem_fn(export_styled_df_write_only, tmp_xlsx('write_only'), df)
+        print_row('', n_cells, mem_reg, mem_wo, round(t_wo, 2))
+
+def bench_multi_sheet(lst_n_shts=(5, 10, 20, 30), n_cells=5_000):
+    """
+    Compare write_df_as_wb_sht per sheet with one write_dfs_as_wb_shts call
+    (per-sheet cost should stay flat for the batched path as sheets are added)
+    JDL 10/17/26
+    """
+    df = make_df(n_cells, kind='numeric')
+    print_row('multi-sheet write', 'sheets', 'per-sheet s', 'batched s', 'ms/sheet')
+    for n_shts in lst_n_shts:
+        sfile = tmp_xlsx('multi_sheet')
+        openpyxl.Workbook().save(sfile)
+        t0 = time.perf_counter()
+        for i in range(n_shts): util.write_df_as_wb_sht(sfile, 'sht' + str(i), df)
+        t_per_sht = time.perf_counter() - t0
+
+        openpyxl.Workbook().save(sfile)
+        d_dfs = {'sht' + str(i):df for i in range(n_shts)}
+        t_batch, _ = time_fn(util.write_dfs_as_wb_shts, sfile, d_dfs)
+        print_row('', n_shts, round(t_per_sht, 2), round(t_batch, 2), round(1000 * t_batch / n_shts, 1))
+
+def bench_rng_iterators(n_rows=100_000, n_cols=10):
+    """
+    Compare legacy per-coordinate rng_iterator with rng_iter_rows on a range
+    of n_rows x n_cols cells (allocating on an empty sheet, then on populated 
+    cells, and lazy reading of an empty range)
+    JDL 10/17/26
+    """
+    def consume_legacy(ws):
+        for c in legacy_rng_iterator(ws, home, end): pass
+    def consume_rows(ws, IsAllocate=True):
+        for row in util.rng_iter_rows(ws, home, end, IsAllocate):
+            for c in row: pass
+
+    print_row('range iteration', 'cells', 'legacy s', 'iter_rows s', 'speedup')
+    ws = openpyxl.Workbook().active
+    home, end = ws.cell(1, 1), ws.cell(n_rows, n_cols)
+    t_legacy, _ = time_fn(consume_legacy, ws)
+    ws = openpyxl.Workbook().active
+    t_rows, _ = time_fn(consume_rows, ws)
+    print_row('  allocate (empty sheet)', n_rows * n_cols, round(t_legacy, 2), round(t_rows, 2), 
+              round(t_legacy / t_rows, 1))
+    t_legacy, _ = time_fn(consume_legacy, ws)
+    t_rows, _ = time_fn(consume_rows, ws)
+    print_row('  existing cells', n_rows * n_cols, round(t_legacy, 2), round(t_rows, 2), 
+              round(t_legacy / t_rows, 1))
+    ws = openpyxl.Workbook().active
+    t_legacy, _ = time_fn(consume_legacy, ws)
+    ws = openpyxl.Workbook().active
+    t_rows, _ = time_fn(consume_rows, ws, False)
+    print_row('  lazy read (empty range)', n_rows * n_cols, round(t_legacy, 2), round(t_rows, 2), 
+              round(t_legacy / t_rows, 1))
+
+def format_df_sequential(ws, df, cell_home):
+    """
+    Write and format df with the per-attribute set_df_* helpers
+    """
+    util.write_dataframe(ws, df, cell_home)
+    util.set_df_borders(ws, df, cell_home)
+    d_cells = util.set_df_openpyxl_cell_locns(ws, df, cell_home)
+    util.set_df_data_align(ws, d_cells, {'horizontal':'center'})
+    util.set_df_cols_align(ws, d_cells, {'horizontal':'center', 'wrap_text':True})
+    util.set_range_num_format(ws, d_cells['cell_home_data'], d_cells['cell_end_data'], '0.00', '"-"')
+
+def format_df_layout(ws, df, cell_home):
+    """
+    Same output as format_df_sequential through a single-pass layout plan
+    """
+    d_layout = util.create_df_layout(ws, df, cell_home)
+    util.add_layout_rule(d_layout, ['data', 'idx', 'idx_name'], style_border='thin')
+    util.add_layout_rule(d_layout, 'cols', style_border='thick', 
+                         d_align={'horizontal':'center', 'wrap_text':True})
+    util.add_layout_rule(d_layout, 'data', d_align={'horizontal':'center'}, num_fmt='0.00', 
+                         num_fmt_zeros='"-"')
+    util.apply_df_layout(ws, d_layout)
+
+def bench_layout(lst_n_cells=(100_000, 500_000)):
+    """
+    Compare sequential set_df_* formatting with one apply_df_layout pass
+    JDL 10/17/26
+    """
+    print_row('write + format DataFrame', 'cells', 'sequential s', 'layout s', 'speedup')
+    for n_cells in lst_n_cells:
+        df = make_df(n_cells, kind='numeric')
+        ws = openpyxl.Workbook().active
+        t_seq, _ = time_fn(format_df_sequential, ws, df, ws.cell(2, 2))
+        ws = openpyxl.Workbook().active
+        t_layout, _ = time_fn(format_df_layout, ws, df, ws.cell(2, 2))
+        print_row('', n_cells, round(t_seq, 2), round(t_layout, 2), round(t_seq / t_layout, 1))
+
+def bench_report(n_shts=8, n_cells=100_000, lst_workers=(2, 4)):
+    """
+    Time building and saving a report of n_shts formatted sheets: serial render
+    and save vs worker processes rendering sheet XML (parent writes the package)
+    JDL 10/17/26
+    """
+    def build_save_serial():
+        util.save_wb(util.build_report(d_sheets), tmp_xlsx('report'))
+
+    rules = [{'regions':['data', 'idx', 'idx_name'], 'style_border':'thin'},
+             {'regions':'cols', 'style_builtin':'Accent1'},
+             {'regions':'data', 'num_fmt':'0.00', 'd_align':{'horizontal':'center'}}]
+    df = make_df(n_cells, kind='numeric')
+    d_sheets = {'sht' + str(i):{'df':df, 'rules':rules, 'IsAutofit':True} for i in range(n_shts)}
+    print_row('build_report + save ' + str(n_shts) + ' sheets', 'workers', 'seconds', 'cpus', 'speedup')
+    t_serial, _ = time_fn(build_save_serial)
+    print_row('', 1, round(t_serial, 2), os.cpu_count(), 1.0)
+    for n_workers in lst_workers:
+        t_build, _ = time_fn(util.build_report, d_sheets, n_workers, sfile=tmp_xlsx('report'))
+        print_row('', n_workers, round(t_build, 2), os.cpu_count(), round(t_serial / t_build, 1))
+
+def bench_clear(n_rows=100_000, n_cols=5):
+    """
+    Compare clear_columns/clear_worksheet with their bulk equivalents
+    JDL 10/17/26
+    """
+    def populated_ws():
+        ws = openpyxl.Workbook().active
+        util.write_rows_to_rng(ws, 1, 1, [[i] * n_cols for i in range(n_rows)])
+        util.set_range_border(ws, ws.cell(1, 1), ws.cell(n_rows, n_cols), 'thin')
+        return ws
+
+    print_row('clear ' + str(n_rows) + ' x ' + str(n_cols), 'cells', 'current s', 'bulk s', 'speedup')
+    t_cur, _ = time_fn(util.clear_columns, populated_ws(), 1, n_cols)
+    t_bulk, _ = time_fn(util.clear_columns_bulk, populated_ws(), 1, n_cols)
+    print_row('  clear_columns', n_rows * n_cols, round(t_cur, 2), round(t_bulk, 3), round(t_cur / t_bulk))
+    t_cur, _ = time_fn(util.clear_worksheet, populated_ws())
+    t_bulk, _ = time_fn(util.clear_worksheet_bulk, populated_ws())
+    print_row('  clear_worksheet', n_rows * n_cols, round(t_cur, 2), round(t_bulk, 3), round(t_cur / t_bulk))
+
+def bench_cond_fmt(lst_n_cells=(50_000, 200_000)):
+    """
+    Compare output file size and style + save time for data region borders and 
+    banded rows applied per cell vs as conditional format rules
+    JDL 10/17/26
+    """
+    def style_and_save(wb, ws, d_cells, IsCondFmt):
+        util.set_df_data_borders(ws, d_cells, 'thin', IsCondFmt=IsCondFmt)
+        cell_home, cell_end = d_cells['cell_home_data'], d_cells['cell_end_data']
+        if IsCondFmt:
+            util.set_range_banded_rows_cf(ws, cell_home, cell_end)
+        else:
+            for row in range(cell_home.row + 1, cell_end.row + 1, 2):
+                for c in ws[row][cell_home.column - 1:cell_end.column]: c.fill = fill_band
+        wb.save(tmp_xlsx('cond_fmt'))
+
+    fill_band = util.set_solid_fill_obj('DDEBF7')
+    print_row('data region style', 'cells', 'cell KB', 'cf KB', 'cell s', 'cf s')
+    for n_cells in lst_n_cells:
+        df = make_df(n_cells, kind='numeric')
+        lst_results = []
+        for IsCondFmt in [False, True]:
+            wb = openpyxl.Workbook()
+            ws = wb.active
+            util.write_dataframe(ws, df, ws.cell(2, 2))
+            d_cells = util.set_df_openpyxl_cell_locns(ws, df, ws.cell(2, 2))
+            t, _ = time_fn(style_and_save, wb, ws, d_cells, IsCondFmt)
+            lst_results.append((os.path.getsize(tmp_xlsx('cond_fmt')) // 1000, round(t, 2)))
+        print_row('', n_cells, lst_results[0][0], lst_results[1][0], lst_results[0][1], lst_results[1][1])
+
+def bench_fast_xml(lst_n_cells=(100_000, 500_000)):
+    """
+    Compare plain DataFrame dump via pandas/openpyxl vs direct XML writer
+    JDL 10/17/26
+    """
+    print_row('plain dump to xlsx', 'cells', 'openpyxl s', 'fast_xml s', 'speedup')
+    for n_cells in lst_n_cells:
+        df = make_df(n_cells)
+        t_pyxl, _ = time_fn(df.to_excel, tmp_xlsx('pyxl'), sheet_name='Sheet1', engine='openpyxl')
+        t_fast, _ = time_fn(util.write_df_xlsx_fast, tmp_xlsx('fast_xml'), df, 'Sheet1', is_index=True)
+        print_row('', n_cells, round(t_pyxl, 2), round(t_fast, 2), round(t_pyxl / t_fast, 1))
+
+def bench_template(lst_n_cells=(100_000, 500_000)):
+    """
+    Compare rendering a repeated report layout with a layout plan vs from the
+    cached layout template (template rendered on the first, untimed call)
+    JDL 10/17/26
+    """
+    rules = [{'regions':['data', 'idx'], 'style_border':'thin', 'num_fmt':'0.00'},
+             {'regions':['cols', 'idx_name'], 'style_builtin':'Accent1', 
+              'd_align':{'horizontal':'center'}}]
+    print_row('repeated report layout', 'cells', 'layout s', 'template s', 'speedup')
+    for n_cells in lst_n_cells:
+        spec = {'df':make_df(n_cells, kind='numeric'), 'rules':rules}
+        util.build_report({'S':spec}, n_workers=1, IsTemplate=True)
+        t_layout, _ = time_fn(util.build_report, {'S':spec}, n_workers=1)
+        t_tmpl, _ = time_fn(util.build_report, {'S':spec}, n_workers=1, IsTemplate=True)
+        print_row('', n_cells, round(t_layout, 2), round(t_tmpl, 2), round(t_layout / t_tmpl, 1))
+
+def bench_save(n_cells=200_000, lst_levels=(None, 0, 1, 9)):
+    """
+    Compare save time and size by zip compresslevel and time the caller is 
+    blocked by a background save
+    JDL 10/17/26
+    """
+    wb = openpyxl.Workbook()
+    util.write_dataframe(wb.active, make_df(n_cells), wb.active.cell(2, 2))
+    print_row('save to BytesIO', 'compresslevel', 'seconds', 'KB')
+    for level in lst_levels:
+        util.save_wb(wb, compresslevel=level)
+        d_stats = util.get_save_stats()
+        print_row('', str(level), round(d_stats['last_seconds'], 2), d_stats['last_bytes'] // 1000)
+    t_block, future = time_fn(util.save_wb, wb, tmp_xlsx('save'), IsBackground=True)
+    future.result()
+    print_row('background save', 'blocked s', 'save s')
+    print_row('', round(t_block, 4), round(util.get_save_stats()['last_seconds'], 2))
+
+def bench_wb_cache(lst_n_cells=(50_000, 200_000)):
+    """
+    Compare open_wb parse vs cached private copy
+    JDL 10/17/26
+    """
+    print_row('open_wb', 'cells', 'load s', 'cached s', 'speedup')
+    for n_cells in lst_n_cells:
+        wb = openpyxl.Workbook()
+        util.write_dataframe(wb.active, make_df(n_cells), wb.active.cell(2, 2))
+        sfile = util.save_wb(wb, tmp_xlsx('wb_cache'))
+        util.clear_wb_cache()
+        t_load, _ = time_fn(util.open_wb, sfile)
+        util.open_wb(sfile, IsCached=True)
+        t_copy, _ = time_fn(util.open_wb, sfile, IsCached=True)
+        print_row('', n_cells, round(t_load, 2), round(t_copy, 2), round(t_load / t_copy, 1))
+
+def bench_block(n_rows=100_000, n_cols=10, n_rows_legacy=20_000):
+    """
+    Compare writing a 2-D array row by row with write_lst_to_rng's former 
+    per-value ws.cell loop vs write_block_to_rng from an array and a generator
+    JDL 10/17/26
+    """
+    def legacy_write_rows(ws, arr):
+        for irow, vals in enumerate(arr.tolist(), start=1):
+            for j, val in enumerate(vals, start=1): ws.cell(row=irow, column=j, value=val)
+
+    arr = np.random.default_rng(0).random((n_rows, n_cols))
+    t_legacy, _ = time_fn(legacy_write_rows, openpyxl.Workbook().active, arr[:n_rows_legacy])
+    t_arr, _ = time_fn(util.write_block_to_rng, openpyxl.Workbook().active, util.CellRef(1, 1), arr)
+    t_gen, _ = time_fn(util.write_block_to_rng, openpyxl.Workbook().active, util.CellRef(1, 1), 
+                       (row for row in arr.tolist()))
+    print_row('2-D block write (us/cell)', 'cells', 'legacy', 'array', 'generator')
+    print_row('', arr.size, round(t_legacy / (n_rows_legacy * n_cols) * 1e6, 2),
+              round(t_arr / arr.size * 1e6, 2), round(t_gen / arr.size * 1e6, 2))
+
+d_benchmarks = {'write_dataframe': bench_write_dataframe,
+                'write_only': bench_write_only,
+                'multi_sheet': bench_multi_sheet,
+                'rng_iterators': bench_rng_iterators,
+                'layout': bench_layout,
+                'report': bench_report,
+                'clear': bench_clear,
+                'cond_fmt': bench_cond_fmt,
+                'fast_xml': bench_fast_xml,
+                'template': bench_template,
+                'save': bench_save,
+                'wb_cache': bench_wb_cache,
+                'block': bench_block}
+
+"""
+===============================================================================
+Benchmark suite with JSON results for tracking regressions between versions
+===============================================================================
+"""
+#Suite cases: name: (kind, n_cols as fraction of n_cells or int)
+d_suite_cases = {'numeric_tall':('numeric', 10), 'numeric_wide':('numeric', 'wide'),
+                 'mixed_tall':('mixed', 10), 'multiindex':('multiindex', 12)}
+
+def suite_df(case, n_cells):
+    """
+    Return synthetic DataFrame for a suite case (wide cases have 100 rows)
+    JDL 10/17/26
+    """
+    kind, n_cols = d_suite_cases[case]
+    if n_cols == 'wide': n_cols = max(n_cells // 100, 1)
+    return make_df(n_cells, n_cols=n_cols, kind=kind)
+
+def written_ws(df):
+    """
+    Return (wb, ws, d_cells) with df written at B(n_col_lvls + 1)
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    cell_home = ws.cell(util.set_num_col_levels(df) + 1, 2)
+    util.write_dataframe_multi_cols(ws, df, cell_home)
+    return wb, ws, util.set_df_openpyxl_cell_locns(ws, df, cell_home)
+
+def suite_ops(df):
+    """
+    Return dict of op name: (setup, fn) where fn(*setup()) is the timed call
+    JDL 10/17/26
+    """
+    is_multi = util.set_num_col_levels(df) > 1
+    def new_ws():
+        ws = openpyxl.Workbook().active
+        return ws, df, ws.cell(util.set_num_col_levels(df) + 1, 2)
+    def ws_home():
+        wb, ws, d_cells = written_ws(df)
+        return ws, df, d_cells['cell_home_data']
+    def ws_cells():
+        wb, ws, d_cells = written_ws(df)
+        return ws, d_cells
+    def saved_file():
+        wb, ws, d_cells = written_ws(df)
+        wb.save(tmp_xlsx('suite'))
+        return (tmp_xlsx('suite'),)
+
+    d_ops = {'write_dataframe_multi_cols':(new_ws, util.write_dataframe_multi_cols)}
+    if not is_multi:
+        d_ops['write_dataframe'] = (new_ws, util.write_dataframe)
+        d_ops['set_df_borders'] = (ws_home, util.set_df_borders)
+        d_ops['set_df_builtin_styles'] = (ws_home, lambda ws, df, c: 
+            util.set_df_builtin_styles(ws, df, c, style_idx='Good', style_cols='Accent1'))
+    d_ops['set_df_borders_multi'] = (ws_home, util.set_df_borders_multi)
+    d_ops['set_df_builtin_styles_multi'] = (ws_home, lambda ws, df, c: 
+        util.set_df_builtin_styles_multi(ws, df, c, style_data='Normal', style_cols='Accent1'))
+    d_ops['set_df_data_align'] = (ws_cells, lambda ws, d: 
+        util.set_df_data_align(ws, d, {'horizontal':'center'}))
+    d_ops['set_df_cols_align_multi'] = (ws_cells, lambda ws, d: 
+        util.set_df_cols_align_multi(ws, d, {'horizontal':'center', 'wrap_text':True}))
+    d_ops['set_df_num_formats'] = (ws_home, lambda ws, df, c: 
+        util.set_df_num_formats(ws, df, c, d_fmt_dtypes={'float':'0.00'}, num_fmt_zeros='"-"'))
+    d_ops['autofit_column_width'] = (ws_cells, lambda ws, d: 
+        [util.autofit_column_width(ws, col) for col in range(1, min(ws.max_column, 20) + 1)])
+    d_ops['save'] = (lambda: written_ws(df)[:1] + (tmp_xlsx('suite'),), lambda wb, s: wb.save(s))
+    d_ops['load'] = (saved_file, util.open_wb)
+    d_ops['ws_to_df'] = (lambda: (util.open_wb(saved_file()[0]).active,), util.ws_to_df)
+    return d_ops
+
+def run_suite(n_cells=100_000, sjson=None, IsMemory=False, sprofile=None, lst_cases=None):
+    """
+    Time (and optionally trace peak memory of) each suite op for each case; 
+    write results to JSON and optionally cProfile the slowest op to sprofile
+    JDL 10/17/26
+    """
+    d_out = {'module_version':module_version(), 'python':platform.python_version(),
+             'openpyxl':openpyxl.__version__, 'pandas':pd.__version__,
+             'n_cells':n_cells, 'results':[]}
+    d_calls = {}
+    for case in (lst_cases or d_suite_cases):
+        df = suite_df(case, n_cells)
+        print_row('suite ' + case + ' ' + str(df.shape), 'seconds', 'peak MB')
+        for op, (setup, fn) in suite_ops(df).items():
+            args = setup()
+            seconds, _ = time_fn(fn, *args)
+            peak_mb = peak_mem_fn(fn, *setup())[1] if IsMemory else None
+            d_out['results'].append({'case':case, 'op':op, 'shape':list(df.shape), 
+                                     'seconds':round(seconds, 4), 'peak_mb':peak_mb})
+            d_calls[(case, op)] = (setup, fn)
+            print_row('  ' + op, round(seconds, 3), '-' if peak_mb is None else peak_mb)
+
+    if sprofile is not None:
+        d_hot = max(d_out['results'], key=lambda d: d['seconds'])
+        setup, fn = d_calls[(d_hot['case'], d_hot['op'])]
+        args = setup()
+        profiler = cProfile.Profile()
+        profiler.runcall(fn, *args)
+        profiler.dump_stats(sprofile)
+        d_out['profile'] = {'case':d_hot['case'], 'op':d_hot['op'], 'file':sprofile}
+    if sjson is not None:
+        with open(sjson, 'w') as f: json.dump(d_out, f, indent=2)
+    return d_out
+
+def module_version():
+    """
+    Return util_openpyxl's version comment (first line of the module)
+    """
+    with open(util.__file__) as f: return f.readline().strip('# \n')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='util_openpyxl benchmarks')
+    parser.add_argument('names', nargs='*', help='suite or benchmark names: ' + ', '.join(d_benchmarks))
+    parser.add_argument('--n-cells', type=int, default=100_000, help='suite cells per case')
+    parser.add_argument('--json', default=None, help='suite results JSON file')
+    parser.add_argument('--memory', action='store_true', help='trace suite peak memory')
+    parser.add_argument('--profile', default=None, help='cProfile output for slowest suite op')
+    args = parser.parse_args()
+    for name in (args.names or list(d_benchmarks)):
+        if name == 'suite':
+            run_suite(args.n_cells, args.json, args.memory, args.profile)
+        else:
+            d_benchmarks[name]()
@@ -1,15 +1,298 @@
-# Version 6/18/24 Add autofit_column_width
+# Version 10/17/26 Add write_block_to_rng 2-D block and generator writer
+import gc
+import os
+import pickle
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, partial, wraps
+from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from io import BytesIO
+from copy import copy
+from xml.sax.saxutils import escape as xml_escape
+from zipfile import ZipFile, ZIP_DEFLATED
+import numpy as np
 import pandas as pd
 import openpyxl
-from openpyxl.styles import Border, Side, Alignment
+from openpyxl.styles import Border, Side, Alignment, PatternFill
+from openpyxl.styles.builtins import styles as builtin_named_styles
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.cell import Cell, MergedCell, WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE, ERROR_CODES
+from openpyxl.writer.excel import ExcelWriter
+from openpyxl.worksheet._writer import WorksheetWriter
+from openpyxl.packaging.relationship import RelationshipList
+from openpyxl.utils.exceptions import IllegalCharacterError
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import (BUILTIN_FORMATS, BUILTIN_FORMATS_MAX_SIZE, 
+                                     BUILTIN_FORMATS_REVERSE)
+from openpyxl.formatting.formatting import ConditionalFormatting
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.merge import MergedCellRange
 import openpyxl.utils as pyxl_util
 
-def open_wb(sfile):
+def open_wb(sfile, read_only=False, data_only=False, IsCached=False):
     """
     open workbook and return openpyxl wb object
-    JDL 3/16/23
+    read_only: lazy-loading read-only mode for large files (close wb when done)
+    data_only: return last-calculated values instead of formulas
+    IsCached: use the open_wb cache (file parsed on first use or after it changes).
+              read_only workbooks are shared (cells can't be modified; the cache 
+              closes them); others are private copies of the parsed workbook
+    JDL 3/16/23; add read_only, data_only, IsCached 10/17/26
+    """
+    if IsCached: return get_cached_wb(sfile, read_only, data_only)
+    return openpyxl.load_workbook(sfile, read_only=read_only, data_only=data_only)
+
+"""
+Workbook cache for open_wb. Entries are keyed by (absolute path, mtime, size, 
+read_only, data_only) so a changed file is re-parsed; LRU bounded by count and
+estimated memory. read_only entries share the wb; others hold only a snapshot
+taken right after parsing, from which each hit rebuilds a private copy
+"""
+WB_CACHE_MAX = 8
+WB_CACHE_MAX_MB = 1024
+WB_CACHE_BYTES_PER_CELL = 400
+WB_SNAPSHOT_BYTES_PER_CELL = 120
+_d_wb_cache = OrderedDict()
+_wb_cache_lock = threading.Lock()
+d_wb_cache_stats = {'hits':0, 'misses':0, 'evictions':0, 'invalidations':0, 'copies':0}
+
+def get_cached_wb(sfile, read_only=False, data_only=False):
+    """
+    Return cached workbook for sfile: shared if read_only, else a private copy
+    (the parse that fills the cache returns its own wb after snapshotting it)
+    JDL 10/17/26
+    """
+    path = os.path.abspath(sfile)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, read_only, data_only)
+    with _wb_cache_lock:
+        d_entry = _d_wb_cache.get(key)
+        if d_entry is not None:
+            d_wb_cache_stats['hits'] += 1
+            _d_wb_cache.move_to_end(key)
+        else:
+            d_wb_cache_stats['misses'] += 1
+
+    if d_entry is None:
+        wb = openpyxl.load_workbook(path, read_only=read_only, data_only=data_only)
+        if read_only:
+            d_entry = {'wb':wb, 'snapshot':None, 'mb':estimate_wb_mb(wb)}
+        else:
+            snapshot = snapshot_wb(wb)
+            n_cells = sum(len(lst) for lst in snapshot['cells'] or [])
+            mb = (len(snapshot['wb']) + n_cells * WB_SNAPSHOT_BYTES_PER_CELL) / 1e6
+            d_entry = {'wb':None, 'snapshot':snapshot, 'mb':mb}
+        with _wb_cache_lock:
+            drop_wb_cache_entries(lambda k: k[0] == path and k[1:3] != key[1:3], 'invalidations')
+            _d_wb_cache[key] = d_entry
+            drop_wb_cache_entries(None, 'evictions')
+        return wb
+
+    if read_only: return d_entry['wb']
+    with _wb_cache_lock: d_wb_cache_stats['copies'] += 1
+    return copy_wb_snapshot(d_entry['snapshot'])
+
+def snapshot_wb(wb):
+    """
+    Return snapshot of a workbook for fast copies: 'wb' is the workbook pickled 
+    without its cells and 'cells' lists (row, col, value, data type, style tuple,
+    is merged) per worksheet. If any cell has a hyperlink or comment, 'cells' 
+    is None and 'wb' is the full pickled workbook
+    JDL 10/17/26
+    """
+    lst_cells, d_styles = [], {}
+    for ws in wb.worksheets:
+        lst = []
+        for (row, col), c in ws._cells.items():
+            style = d_styles.setdefault(tuple(c._style), tuple(c._style))
+            if isinstance(c, MergedCell):
+                lst.append((row, col, None, None, style, True))
+            elif c._hyperlink is not None or c._comment is not None:
+                return {'wb':pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL), 'cells':None}
+            else:
+                lst.append((row, col, c._value, c.data_type, style, False))
+        lst_cells.append(lst)
+
+    #Pickle with each worksheet's cell store replaced by an empty dict
+    f = BytesIO()
+    CellStorePickler(f, {id(ws._cells) for ws in wb.worksheets}).dump(wb)
+    return {'wb':f.getvalue(), 'cells':lst_cells}
+
+class CellStorePickler(pickle.Pickler):
+    """
+    Pickler that writes worksheet cell store dicts (by id) as empty placeholders
+    JDL 10/17/26
+    """
+    def __init__(self, f, set_ids):
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.set_ids = set_ids
+
+    def persistent_id(self, obj):
+        return 'cells' if id(obj) in self.set_ids else None
+
+class CellStoreUnpickler(pickle.Unpickler):
+    """
+    Unpickler that restores CellStorePickler placeholders as new empty dicts
+    JDL 10/17/26
+    """
+    def persistent_load(self, pid):
+        return {}
+
+def copy_wb_snapshot(snapshot):
+    """
+    Return a new workbook from a snapshot_wb snapshot
+    JDL 10/17/26
+    """
+    if snapshot['cells'] is None: return pickle.loads(snapshot['wb'])
+    wb = CellStoreUnpickler(BytesIO(snapshot['wb'])).load()
+    for ws, lst in zip(wb.worksheets, snapshot['cells']):
+        d_arrays = {}
+        for row, col, value, data_type, style, is_merged in lst:
+            style_array = d_arrays.get(style)
+            if style_array is None: style_array = d_arrays[style] = StyleArray(style)
+            if is_merged:
+                c = MergedCell(ws, row, col)
+                c._style = StyleArray(style_array)
+                ws._cells[(row, col)] = c
+            else:
+                store_cell(ws, row, col, value, style_array, data_type)
+    return wb
+
+def drop_wb_cache_entries(is_drop, stat_name):
+    """
+    Remove cache entries whose key satisfies is_drop (None to evict least 
+    recently used entries beyond WB_CACHE_MAX or WB_CACHE_MAX_MB); call with lock held
+    JDL 10/17/26
+    """
+    if is_drop is None:
+        lst_keys = []
+        n, mb = len(_d_wb_cache), sum(d['mb'] for d in _d_wb_cache.values())
+        for key, d_entry in _d_wb_cache.items():
+            if n <= 1 or (n <= WB_CACHE_MAX and mb <= WB_CACHE_MAX_MB): break
+            lst_keys.append(key)
+            n, mb = n - 1, mb - d_entry['mb']
+    else:
+        lst_keys = [key for key in _d_wb_cache if is_drop(key)]
+    for key in lst_keys:
+        d_entry = _d_wb_cache.pop(key)
+        if d_entry['wb'] is not None: d_entry['wb'].close()
+        d_wb_cache_stats[stat_name] += 1
+
+def estimate_wb_mb(wb):
+    """
+    Return estimated memory (MB) of a loaded workbook from its cell count
+    (read_only workbooks load cells lazily so are counted as 0)
+    JDL 10/17/26
+    """
+    n_cells = sum(len(getattr(ws, '_cells', ())) for ws in wb.worksheets)
+    return n_cells * WB_CACHE_BYTES_PER_CELL / 1e6
+
+def invalidate_wb_cache(sfile=None):
     """
-    return openpyxl.load_workbook(sfile)
+    Remove cached workbooks for sfile (None for all files)
+    JDL 10/17/26
+    """
+    path = None if sfile is None else os.path.abspath(sfile)
+    with _wb_cache_lock:
+        drop_wb_cache_entries(lambda k: path is None or k[0] == path, 'invalidations')
+
+def get_wb_cache_stats():
+    """
+    Return dict of workbook cache counters, entry count and estimated MB
+    JDL 10/17/26
+    """
+    with _wb_cache_lock:
+        return dict(d_wb_cache_stats, n_wbs=len(_d_wb_cache), 
+                    mb=round(sum(d['mb'] for d in _d_wb_cache.values()), 1))
+
+def clear_wb_cache():
+    """
+    Clear cached workbooks and counters
+    JDL 10/17/26
+    """
+    invalidate_wb_cache()
+    for key in d_wb_cache_stats: d_wb_cache_stats[key] = 0
+
+#Save serialization stats (seconds and bytes exclude time spent building cells)
+d_save_stats = {'n_saves':0, 'seconds':0.0, 'last_seconds':None, 'last_bytes':None}
+_save_lock = threading.Lock()
+_save_executor = None
+
+def save_wb(wb, sfile=None, compresslevel=None, IsBackground=False, callback=None):
+    """
+    Save openpyxl wb object to sfile (path or binary file object such as BytesIO;
+    None to save to and return a new BytesIO positioned at its start)
+    compresslevel: zip deflate level 0-9 (None for zlib default; lower is faster)
+    IsBackground: save on a background thread and return a Future of sfile
+    (saves run one at a time in call order; don't modify wb until done)
+    callback: called with the Future when a background save finishes
+    JDL 10/17/26
+    """
+    IsRewind = sfile is None
+    if IsRewind: sfile = BytesIO()
+    if not IsBackground: return serialize_wb(wb, sfile, compresslevel, IsRewind=IsRewind)
+
+    global _save_executor
+    with _save_lock:
+        if _save_executor is None: _save_executor = ThreadPoolExecutor(max_workers=1)
+    future = _save_executor.submit(serialize_wb, wb, sfile, compresslevel, IsRewind=IsRewind)
+    if callback is not None: future.add_done_callback(callback)
+    return future
+
+def serialize_wb(wb, sfile, compresslevel=None, d_sheet_xml=None, IsRewind=False):
+    """
+    Write wb as xlsx to sfile with openpyxl's ExcelWriter and a ZipFile at 
+    compresslevel; record timing and size in d_save_stats
+    d_sheet_xml: {sheet title: worksheet XML} written in place of those sheets' cells
+    IsRewind: seek file object sfile back to its start after writing
+    JDL 10/17/26
+    """
+    if wb.read_only: raise TypeError("Workbook is read-only")
+    if wb.write_only and not wb.worksheets: wb.create_sheet()
+    t0 = time.perf_counter()
+    archive = ZipFile(sfile, 'w', ZIP_DEFLATED, allowZip64=True, compresslevel=compresslevel)
+    wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    SheetXmlWriter(wb, archive, d_sheet_xml).save()
+
+    seconds = time.perf_counter() - t0
+    n_bytes = sfile.tell() if hasattr(sfile, 'tell') else os.path.getsize(sfile)
+    if IsRewind: sfile.seek(0)
+    with _save_lock:
+        d_save_stats['n_saves'] += 1
+        d_save_stats['seconds'] += seconds
+        d_save_stats['last_seconds'] = seconds
+        d_save_stats['last_bytes'] = n_bytes
+    return sfile
+
+def get_save_stats():
+    """
+    Return dict of save counters and last save's seconds and bytes
+    JDL 10/17/26
+    """
+    with _save_lock: return dict(d_save_stats)
+
+class SheetXmlWriter(ExcelWriter):
+    """
+    ExcelWriter that writes finished worksheet XML {sheet title: XML} in place
+    of those sheets' cells (XML with no relationships, e.g. from render_sheet_xml)
+    JDL 10/17/26
+    """
+    def __init__(self, workbook, archive, d_sheet_xml=None):
+        super().__init__(workbook, archive)
+        self.d_sheet_xml = d_sheet_xml or {}
+
+    def write_worksheet(self, ws):
+        if ws.title not in self.d_sheet_xml: return super().write_worksheet(ws)
+        ws._rels = RelationshipList()
+        self._archive.writestr(ws.path[1:], self.d_sheet_xml[ws.title])
+        self.manifest.append(ws)
 
 def delete_sht(wb, sht):
     """
@@ -28,11 +311,37 @@ def write_df_as_wb_sht(sfile, sht, df, is_index=False):
     with pd.ExcelWriter(sfile, engine='openpyxl', mode='a') as writer:
         df.to_excel(writer, sheet_name=sht, index=is_index)
 
+def write_dfs_as_wb_shts(sfile, d_dfs, is_index=False, if_exists='replace'):
+    """
+    write dict of {sheet name: DataFrame} to an Excel Workbook in one pass
+    (workbook is loaded once and saved once; created if sfile does not exist)
+    if_exists: 'replace' (delete_sht and write in same sheet position) or 'skip'
+    JDL 10/17/26
+    """
+    if if_exists not in ['replace', 'skip']:
+        raise ValueError("if_exists must be 'replace' or 'skip'")
+    if os.path.isfile(sfile):
+        kwargs = {'mode':'a', 'if_sheet_exists':'overlay'}
+    else:
+        kwargs = {'mode':'w'}
+    with pd.ExcelWriter(sfile, engine='openpyxl', **kwargs) as writer:
+        wb = writer.book
+        for sht, df in d_dfs.items():
+            if sht in wb.sheetnames:
+                if if_exists == 'skip': continue
+
+                #Replace with an empty sheet at the same position
+                idx = wb.sheetnames.index(sht)
+                wb = delete_sht(wb, sht)
+                wb.create_sheet(sht, idx)
+            df.to_excel(writer, sheet_name=sht, index=is_index)
+
 def clear_worksheet(ws):
     """
     Clear Excel worksheet (ws object in an openpyxl wb object)
     JDL 4/21/23
     """
+    invalidate_value_index(ws)
     ws.delete_rows(1, ws.max_row)
     ws.delete_cols(1, ws.max_column)
     return ws
@@ -41,6 +350,7 @@ def clear_cell(cell):
     """
     openyxl clear a cell's value, formatting and cell comment/note
     """
+    invalidate_value_index(cell.parent)
     cell.value = None
     cell.font = openpyxl.styles.Font()
     cell.border = openpyxl.styles.Border()
@@ -58,29 +368,147 @@ def ws_to_df(ws):
     df = pd.DataFrame(data)
     return df
 
+def ws_to_df_chunks(ws, chunk_rows=10000, header=False, usecols=None, dtypes=None, 
+                    min_row=1):
+    """
+    Generator of DataFrames of up to chunk_rows rows from an openpyxl ws
+    (use with open_wb(sfile, read_only=True) to read large sheets in bounded memory)
+    header: True to use the first row as column names; 'infer' to use it only if 
+            all its values are non-empty strings; False for range columns
+    usecols: list of column names (if header) or 0-based column positions to keep
+    dtypes: dict of column name/position to dtype passed to DataFrame.astype
+    JDL 10/17/26
+    """
+    rows = ws.iter_rows(min_row=min_row, values_only=True)
+    first = next(rows, None)
+    if first is None: return
+
+    #Set column labels and whether first row is data
+    is_header = header is True or (header == 'infer' and is_header_row(first))
+    cols = list(first) if is_header else list(range(len(first)))
+    chunk = [] if is_header else [first]
+
+    #Column positions to keep (positions or names if header)
+    if usecols is None:
+        icols = list(range(len(cols)))
+    else:
+        icols = [col if not is_header else cols.index(col) for col in usecols]
+    cols_keep = [cols[i] for i in icols]
+
+    irow = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            yield rows_to_df(chunk, icols, cols_keep, dtypes, irow)
+            irow, chunk = irow + chunk_rows, []
+    if len(chunk) > 0: yield rows_to_df(chunk, icols, cols_keep, dtypes, irow)
+
+def is_header_row(row):
+    """
+    Return True if all values in a row tuple are non-empty strings
+    JDL 10/17/26
+    """
+    return len(row) > 0 and all(isinstance(val, str) and len(val) > 0 for val in row)
+
+def rows_to_df(rows, icols, cols, dtypes=None, irow_start=0):
+    """
+    Build a DataFrame from row tuples keeping column positions icols
+    (rows shorter than the header are padded with None; index starts at irow_start)
+    JDL 10/17/26
+    """
+    data = [[row[i] if i < len(row) else None for i in icols] for row in rows]
+    idx = pd.RangeIndex(irow_start, irow_start + len(rows))
+    df = pd.DataFrame(data, columns=cols, index=idx)
+    if dtypes is not None: df = df.astype(dtypes)
+    return df
+
 def clear_columns(ws, col1, col2):
     """
     Clear specified columns
     """
+    invalidate_value_index(ws)
     for col in range(col1, col2+1):
         for row in range(1, ws.max_row + 1):
             clear_cell(ws.cell(row=row, column=col))
     return ws
 
-def find_string_in_row(ws, irow, sfind):
+def clear_worksheet_bulk(ws):
+    """
+    Clear worksheet by dropping all cells, merged ranges and conditional formats
+    (no row/column shifting or per-cell style resets as in clear_worksheet)
+    JDL 10/17/26
+    """
+    return clear_rng_bulk(ws, 1, 1, max(ws.max_row, 1), max(ws.max_column, 1))
+
+def clear_columns_bulk(ws, col1, col2):
+    """
+    Clear specified columns by dropping their cells (bulk clear_columns)
+    JDL 10/17/26
+    """
+    return clear_rng_bulk(ws, 1, col1, max(ws.max_row, 1), col2)
+
+def clear_rng_bulk(ws, row1, col1, row2, col2):
+    """
+    Clear a rectangular range by dropping its cells (values, styles and comments)
+    from the worksheet's cell store. Merged ranges that intersect the range are 
+    unmerged and conditional formats lying inside it are removed
+    JDL 10/17/26
+    """
+    invalidate_value_index(ws)
+    rng = CellRange(min_col=col1, min_row=row1, max_col=col2, max_row=row2)
+
+    #Unmerge intersecting merged ranges (removes their MergedCells)
+    for mcr in list(ws.merged_cells.ranges):
+        if not mcr.isdisjoint(rng): ws.unmerge_cells(mcr.coord)
+
+    #Drop cells; iterate whichever is smaller, the range or the cell store
+    cells = ws._cells
+    if rng.size['rows'] * rng.size['columns'] < len(cells):
+        for row in range(row1, row2 + 1):
+            for col in range(col1, col2 + 1): cells.pop((row, col), None)
+    else:
+        for key in [k for k in cells if row1 <= k[0] <= row2 and col1 <= k[1] <= col2]:
+            del cells[key]
+    ws._current_row = max((k[0] for k in cells), default=0)
+
+    clear_rng_cond_formats(ws, rng)
+    return ws
+
+def clear_rng_cond_formats(ws, rng):
+    """
+    Remove conditional format ranges lying inside CellRange rng (formats with 
+    no remaining ranges are dropped)
+    JDL 10/17/26
+    """
+    d_new = OrderedDict()
+    for cf, rules in ws.conditional_formatting._cf_rules.items():
+        lst_keep = [cr for cr in cf.sqref.ranges if not cr.issubset(rng)]
+        if len(lst_keep) == len(cf.sqref.ranges):
+            d_new[cf] = rules
+        elif len(lst_keep) > 0:
+            sqref = ' '.join(cr.coord for cr in lst_keep)
+            d_new[ConditionalFormatting(sqref, pivot=cf.pivot)] = rules
+    ws.conditional_formatting._cf_rules = d_new
+    return ws
+
+def find_string_in_row(ws, irow, sfind, IsIndexed=False):
     """
     Find cell with specified string in specified row
-    JDL 4/25/23
+    IsIndexed: use the worksheet's value index (built on first lookup)
+    JDL 4/25/23; add IsIndexed 10/17/26
     """
+    if IsIndexed: return find_value_indexed(ws, sfind, irow=irow)
     for c in ws[irow]:
         if c.value == sfind: return c
     return None
 
-def find_string_in_col(ws, icol, sfind):
+def find_string_in_col(ws, icol, sfind, IsIndexed=False):
     """
     Find cell with specified string in specified column
-    JDL 4/25/23
+    IsIndexed: use the worksheet's value index (built on first lookup)
+    JDL 4/25/23; add IsIndexed 10/17/26
     """
+    if IsIndexed: return find_value_indexed(ws, sfind, icol=icol)
     for col in ws.iter_cols(min_col=icol, max_col=icol):
         for c in col: 
             if c.value == sfind: return c
@@ -90,15 +518,121 @@ def write_lst_to_rng(ws, cell_home, lstvals, direction='row'):
     """
     Write list of values to cells in specified row or column on openpyxl ws
     direction: either 'row' or 'col'
-    JDL 4/25/23
+    JDL 4/25/23; use write_block_to_rng 10/17/26
     """
-    for i, val in enumerate(lstvals):
-        if direction == 'row':
-            ws.cell(row=cell_home.row, column=cell_home.column+i, value=val)
-        elif direction == 'col':
-            ws.cell(row=cell_home.row+i, column=cell_home.column, value=val)
+    if direction not in ['row', 'col']: return ws
+    return write_block_to_rng(ws, cell_home, [list(lstvals)], IsTranspose=direction == 'col', 
+                              IsMapNaN=False, IsSkipNone=True)
+
+def write_block_to_rng(ws, cell_home, block, IsTranspose=False, IsMapNaN=True, na_value=None,
+                       batch_rows=1000, IsSkipNone=False):
+    """
+    Write a 2-D block of values with its top left at cell_home (cell, CellRef or Rng)
+    block: 2-D NumPy array (1-D as one row), list of row sequences or an iterable 
+           (e.g. generator) of rows consumed in batches of batch_rows without 
+           materializing it; rows may differ in length
+    IsTranspose: write each block row down a column
+    IsMapNaN: write missing values (None, NaN, NaT) as na_value (None for empty)
+    IsSkipNone: leave existing values of cells where the block value is None
+    JDL 10/17/26
+    """
+    row_home, col_home = rng_bounds(cell_home)[:2]
+    if isinstance(block, np.ndarray):
+        arr = block.reshape(1, -1) if block.ndim == 1 else block
+        rows = iter_array_rows(arr.T if IsTranspose else arr, IsMapNaN, na_value, batch_rows)
+        return write_rows_to_rng(ws, row_home, col_home, rows, batch_rows, IsSkipNone=IsSkipNone)
+
+    if IsMapNaN: block = ([na_value if is_missing_value(val) else val for val in vals] 
+                          for vals in block)
+    if not IsTranspose: 
+        return write_rows_to_rng(ws, row_home, col_home, block, batch_rows, IsSkipNone=IsSkipNone)
+
+    #Transposed stream: each batch of block rows is written as a batch of columns
+    invalidate_value_index(ws)
+    batch = []
+    for vals in block:
+        batch.append(vals)
+        if len(batch) == batch_rows:
+            write_row_batch(ws, row_home, col_home, transpose_rows(batch), IsSkipNone=IsSkipNone)
+            col_home, batch = col_home + batch_rows, []
+    if len(batch) > 0: 
+        write_row_batch(ws, row_home, col_home, transpose_rows(batch), IsSkipNone=IsSkipNone)
     return ws
 
+def iter_array_rows(arr, IsMapNaN=True, na_value=None, batch_rows=1000):
+    """
+    Generator of rows of native values from a 2-D array, converted in batches
+    (datetime64 as datetime.datetime; NaN and NaT mapped to na_value if IsMapNaN)
+    JDL 10/17/26
+    """
+    for irow in range(0, arr.shape[0], batch_rows):
+        arr_batch = arr[irow:irow + batch_rows]
+        if arr_batch.dtype.kind == 'M': 
+            arr_batch = arr_batch.astype('datetime64[us]').astype(object)
+        if IsMapNaN and arr_batch.dtype.kind in 'fcO':
+            is_missing = pd.isna(arr_batch)
+            if is_missing.any():
+                arr_batch = arr_batch.astype(object)
+                arr_batch[is_missing] = na_value
+        yield from arr_batch.tolist()
+
+def is_missing_value(val):
+    """
+    Return True for None, float NaN, NaT and pd.NA
+    JDL 10/17/26
+    """
+    return val is None or val is pd.NaT or val is pd.NA or (isinstance(val, float) and val != val)
+
+def transpose_rows(batch):
+    """
+    Return list of rows of a transposed batch of rows (short rows padded with None)
+    JDL 10/17/26
+    """
+    return list(zip_longest(*batch))
+
+"""
+Worksheet value index for repeated lookups. Helpers that write or clear 
+cells call invalidate_value_index; call it after direct ws.cell edits
+"""
+_wd_value_index = weakref.WeakKeyDictionary()
+
+def get_value_index(ws):
+    """
+    Return (building on first use) dict of cell value: list of (row, col) 
+    coordinates in row-major order for a worksheet
+    JDL 10/17/26
+    """
+    d_index = _wd_value_index.get(ws)
+    if d_index is not None: return d_index
+    d_index = {}
+    for row, col, val in sorted(iter_cell_values(ws), key=lambda t: (t[0], t[1])):
+        if val is None: continue
+        try:
+            d_index.setdefault(val, []).append((row, col))
+        except TypeError:
+            pass
+    _wd_value_index[ws] = d_index
+    return d_index
+
+def find_value_indexed(ws, val, irow=None, icol=None):
+    """
+    Return first cell (row-major; restricted to row irow and/or column icol) 
+    whose value equals val, or None
+    JDL 10/17/26
+    """
+    for row, col in get_value_index(ws).get(val, []):
+        if irow is not None and row != irow: continue
+        if icol is not None and col != icol: continue
+        return ws.cell(row, col)
+    return None
+
+def invalidate_value_index(ws):
+    """
+    Discard a worksheet's value index after its cells change
+    JDL 10/17/26
+    """
+    _wd_value_index.pop(ws, None)
+
 def toggle_sheet_visibility(wb, sht, IsHide=True):
     """
     Toggle the visibility of a sheet in an openpyxl workbook.
@@ -114,39 +648,278 @@ def toggle_sheet_visibility(wb, sht, IsHide=True):
         ws.sheet_state = 'visible'
 """ 
 ===============================================================================
+Coordinate-only cell references and ranges (no ws cells are created until a
+range is iterated). Range helpers accept a Rng as cell_home with cell_end None
+===============================================================================
+"""
+class CellRef:
+    """
+    Row and column of a worksheet cell without creating the cell. Has the
+    .row and .column used by helpers that take openpyxl home and end cells
+    JDL 10/17/26
+    """
+    __slots__ = ('row', 'column')
+
+    def __init__(self, row, column):
+        self.row, self.column = row, column
+
+    @classmethod
+    def from_cell(cls, c):
+        """
+        Return CellRef for an openpyxl cell (or the CellRef itself)
+        """
+        return c if isinstance(c, CellRef) else cls(c.row, c.column)
+
+    @property
+    def coordinate(self):
+        return pyxl_util.get_column_letter(self.column) + str(self.row)
+
+    def offset(self, irows=0, icols=0):
+        """
+        Return CellRef irows below and icols right of this one
+        """
+        return CellRef(self.row + irows, self.column + icols)
+
+    def cell(self, ws):
+        """
+        Return (creating if needed) the ws cell at this reference
+        """
+        return ws.cell(self.row, self.column)
+
+    def __eq__(self, other):
+        return isinstance(other, CellRef) and (self.row, self.column) == (other.row, other.column)
+
+    def __hash__(self):
+        return hash((self.row, self.column))
+
+    def __repr__(self):
+        return 'CellRef({0}, {1})'.format(self.row, self.column)
+
+class Rng:
+    """
+    Rectangular range of worksheet coordinates (1-based, inclusive bounds)
+    rng[i, j] slices relative to the range's top left (0-based, like a DataFrame
+    .iloc; int keeps the dimension as one row or column) and returns a Rng
+    JDL 10/17/26
+    """
+    __slots__ = ('min_row', 'min_col', 'max_row', 'max_col')
+
+    def __init__(self, min_row, min_col, max_row=None, max_col=None):
+        self.min_row, self.min_col = min_row, min_col
+        self.max_row = min_row if max_row is None else max_row
+        self.max_col = min_col if max_col is None else max_col
+
+    @classmethod
+    def from_cells(cls, cell_home, cell_end=None):
+        """
+        Return Rng spanning openpyxl cells or CellRefs (single cell if no cell_end)
+        """
+        return cls(*rng_bounds(cell_home, cell_end))
+
+    @property
+    def bounds(self):
+        return self.min_row, self.min_col, self.max_row, self.max_col
+
+    @property
+    def home(self):
+        return CellRef(self.min_row, self.min_col)
+
+    @property
+    def end(self):
+        return CellRef(self.max_row, self.max_col)
+
+    @property
+    def n_rows(self):
+        return self.max_row - self.min_row + 1
+
+    @property
+    def n_cols(self):
+        return self.max_col - self.min_col + 1
+
+    @property
+    def size(self):
+        return max(self.n_rows, 0) * max(self.n_cols, 0)
+
+    @property
+    def coord(self):
+        return rng_coord(self)
+
+    def offset(self, irows=0, icols=0):
+        """
+        Return Rng of the same shape shifted irows down and icols right
+        """
+        return Rng(self.min_row + irows, self.min_col + icols, 
+                   self.max_row + irows, self.max_col + icols)
+
+    def intersect(self, other):
+        """
+        Return Rng overlapping other Rng (or None if they don't overlap)
+        """
+        min_row, min_col = max(self.min_row, other.min_row), max(self.min_col, other.min_col)
+        max_row, max_col = min(self.max_row, other.max_row), min(self.max_col, other.max_col)
+        if min_row > max_row or min_col > max_col: return None
+        return Rng(min_row, min_col, max_row, max_col)
+
+    __and__ = intersect
+
+    def iter_rows(self, ws, IsAllocate=True):
+        """
+        Return iterator of row tuples of ws cells in the range (see rng_iter_rows)
+        """
+        return iter_rows_coords(ws, *self.bounds, IsAllocate)
+
+    def __getitem__(self, key):
+        key_rows, key_cols = key if isinstance(key, tuple) else (key, slice(None))
+        row1, row2 = rng_slice_bounds(key_rows, self.min_row, self.n_rows)
+        col1, col2 = rng_slice_bounds(key_cols, self.min_col, self.n_cols)
+        return Rng(row1, col1, row2, col2)
+
+    def __contains__(self, c):
+        row, col = c if isinstance(c, tuple) else (c.row, c.column)
+        return self.min_row <= row <= self.max_row and self.min_col <= col <= self.max_col
+
+    def __eq__(self, other):
+        return isinstance(other, Rng) and self.bounds == other.bounds
+
+    def __hash__(self):
+        return hash(self.bounds)
+
+    def __repr__(self):
+        return 'Rng({0}, {1}, {2}, {3})'.format(*self.bounds)
+
+def rng_slice_bounds(key, start, n):
+    """
+    Return (first, last) worksheet index for an int or step 1 slice key into n 
+    positions beginning at start
+    JDL 10/17/26
+    """
+    if isinstance(key, slice):
+        idx = range(n)[key]
+        if idx.step != 1 or len(idx) == 0: raise IndexError('Rng slices must be non-empty with step 1')
+        return start + idx[0], start + idx[-1]
+    idx = range(n)[key]
+    return start + idx, start + idx
+
+def rng_bounds(cell_home, cell_end=None):
+    """
+    Return (row_start, col_start, row_end, col_end) for a Rng or for home and 
+    end cells (openpyxl cells or CellRefs; single cell if cell_end is None)
+    JDL 10/17/26
+    """
+    if isinstance(cell_home, Rng): return cell_home.bounds
+    if cell_end is None: cell_end = cell_home
+    return cell_home.row, cell_home.column, cell_end.row, cell_end.column
+
+class DfCells(dict):
+    """
+    Record of a DataFrame's locations on a ws from set_df_openpyxl_cell_locns
+    Keys are the original cell_home_data, cell_end_data etc. (CellRefs) and 
+    n_col_lvls; properties return the regions as Rngs
+    JDL 10/17/26
+    """
+    @property
+    def n_col_lvls(self):
+        return self['n_col_lvls']
+
+    @property
+    def data(self):
+        return Rng.from_cells(self['cell_home_data'], self['cell_end_data'])
+
+    @property
+    def idx(self):
+        return Rng.from_cells(self['cell_home_idx'], self['cell_end_idx'])
+
+    @property
+    def cols(self):
+        return Rng.from_cells(self['cell_home_cols'], self['cell_end_cols'])
+
+    @property
+    def cols_rng(self):
+        return Rng.from_cells(self['cell_cols_rng_begin'], self['cell_cols_rng_end'])
+
+    @property
+    def idx_name(self):
+        row, col = row_col(self['cell_home_idx'])
+        return Rng(row - self['n_col_lvls'], col, row - 1, col)
+
+""" 
+===============================================================================
 Range iterators
 ===============================================================================
 """
 
-def rng_iterator(ws, cell_home, cell_end):
+def rng_iterator(ws, cell_home, cell_end=None):
     """
     Return row-wise iterator to iterate over cells in range
-    specified by openpyxl home and end cells. Usage: for c in cell_iterator(xxx):
-    JDL 4/21/23
+    specified by openpyxl home and end cells (or a Rng as cell_home). 
+    Usage: for c in cell_iterator(xxx):
+    JDL 4/21/23; use rng_iter_rows 10/17/26
     """
-    row_start, col_start = cell_home.row, cell_home.column
-    row_end, col_end = cell_end.row, cell_end.column
-
-    for row in range(row_start, row_end+1):
-        for col in range(col_start, col_end+1):
-            cell = ws.cell(row=row, column=col)
-            yield cell
+    for row in rng_iter_rows(ws, cell_home, cell_end):
+        yield from row
             
-def rng_iterator_enum(ws, cell_home, cell_end):
+def rng_iterator_enum(ws, cell_home, cell_end=None):
     """
     Return row-wise iterator with row, column enumeration to iterate 
     over cells in a range specified by openpyxl home and end cells.
     Usage: for i, j, c in cell_iterator(xxx): where i and j are the
     row and column indices of cells c returned by the generator
-    JDL 4/21/23
+    JDL 4/21/23; use rng_iter_rows 10/17/26
     """
-    start_row, start_col = cell_home.row, cell_home.column
-    end_row, end_col,  = cell_end.row, cell_end.column, 
-    for i, row in enumerate(range(start_row, end_row+1), start=1):
-        for j, col in enumerate(range(start_col, end_col+1), start=1):
-            cell = ws.cell(row=row, column=col)
+    for i, row in enumerate(rng_iter_rows(ws, cell_home, cell_end), start=1):
+        for j, cell in enumerate(row, start=1):
             yield (i, j, cell)
 
+def rng_iter_rows(ws, cell_home, cell_end=None, IsAllocate=True):
+    """
+    Return iterator of row tuples of cells in range specified by openpyxl 
+    home and end cells (or a Rng as cell_home). Existing cells are looked up directly in the ws cell
+    store; IsAllocate=True creates missing cells (for writing) while False
+    returns None in their place without creating them (for reading)
+    JDL 10/17/26
+    """
+    return iter_rows_coords(ws, *rng_bounds(cell_home, cell_end), IsAllocate)
+
+def iter_rows_coords(ws, row_start, col_start, row_end, col_end, IsAllocate=True):
+    """
+    rng_iter_rows for a range specified by row and column numbers
+    JDL 10/17/26
+    """
+    cols = range(col_start, col_end + 1)
+
+    #Read-only worksheets have no cell store and don't create cells
+    cells = getattr(ws, '_cells', None)
+    if cells is None:
+        yield from ws.iter_rows(min_row=row_start, max_row=row_end, 
+                                min_col=col_start, max_col=col_end)
+        return
+
+    if not IsAllocate:
+        for row in range(row_start, row_end + 1):
+            yield tuple(cells.get((row, col)) for col in cols)
+        return
+
+    #Allocate missing cells directly (bounds checked once rather than per ws.cell call)
+    if row_start < 1 or col_start < 1 or row_end > 1048576:
+        raise ValueError("Row or column values out of Excel bounds")
+    for row in range(row_start, row_end + 1):
+        lst_cells = []
+        for col in cols:
+            c = cells.get((row, col))
+            if c is None:
+                c = Cell(ws, row=row, column=col)
+                ws._add_cell(c)
+            lst_cells.append(c)
+        yield tuple(lst_cells)
+
+def rng_iter_values(ws, cell_home, cell_end=None):
+    """
+    Return iterator of row tuples of values in a range without creating cells
+    JDL 10/17/26
+    """
+    for row in rng_iter_rows(ws, cell_home, cell_end, IsAllocate=False):
+        yield tuple(None if c is None else c.value for c in row)
+
 """ 
 ===============================================================================
 Functions for writing DataFrame values and setting dict for df cell locations
@@ -169,17 +942,17 @@ def write_dataframe(ws, df, cell_home):
 
 def set_df_openpyxl_cell_locns(ws, df, cell_home):
     """
-    Set ws.cells for ranges of data, index and columns
-    cell_home argument is ws.cell for top left data cell in Excel
-    JDL 4/23/23; Add n_col_lvls 3/11/24
+    Set DfCells record of CellRefs for ranges of data, index and columns
+    cell_home argument is ws.cell (or CellRef) for top left data cell in Excel
+    JDL 4/23/23; Add n_col_lvls 3/11/24; CellRefs without creating cells 10/17/26
     """
     row, col = row_col(cell_home)
-    d_cells = {'cell_home_data':cell_home}
-    d_cells['cell_end_data'] = ws.cell(row + df.index.size - 1, col + df.columns.size - 1)
-    d_cells['cell_home_idx'] = ws.cell(row, col - 1)
-    d_cells['cell_end_idx'] = ws.cell(row + df.index.size - 1, col - 1)
-    d_cells['cell_home_cols'] = ws.cell(row - 1, col)
-    d_cells['cell_end_cols'] = ws.cell(row - 1, col + df.columns.size - 1)
+    d_cells = DfCells(cell_home_data=CellRef(row, col))
+    d_cells['cell_end_data'] = CellRef(row + df.index.size - 1, col + df.columns.size - 1)
+    d_cells['cell_home_idx'] = CellRef(row, col - 1)
+    d_cells['cell_end_idx'] = CellRef(row + df.index.size - 1, col - 1)
+    d_cells['cell_home_cols'] = CellRef(row - 1, col)
+    d_cells['cell_end_cols'] = CellRef(row - 1, col + df.columns.size - 1)
 
     #Added 3/11/24 for multiindex cols - should refactor to just used cell_home_cols
     d_cells['n_col_lvls'] = set_num_col_levels(df)
@@ -197,6 +970,7 @@ def set_num_col_levels(df):
 def offset_cell(ws, cell, irows=0, icols=0):
     """
     Return a cell that is irows below the specified cell
+    (creates the cell; use CellRef.offset for coordinates only)
     JDL 3/11/24
     """
     return ws.cell(row=cell.row + irows, column=cell.column + icols)
@@ -209,7 +983,7 @@ def set_cols_rng_begin(ws, d_cells):
     if d_cells['n_col_lvls'] == 0 :
         return d_cells['cell_home_cols']
     else:
-        return offset_cell(ws, d_cells['cell_home_cols'], irows= - d_cells['n_col_lvls'] + 1)
+        return CellRef.from_cell(d_cells['cell_home_cols']).offset(irows= - d_cells['n_col_lvls'] + 1)
 
 def set_cols_rng_end(ws, d_cells):
     """
@@ -219,7 +993,7 @@ def set_cols_rng_end(ws, d_cells):
     if d_cells['n_col_lvls'] == 0 :
         return d_cells['cell_end_cols']
     else:
-        return offset_cell(ws, d_cells['cell_end_cols'], irows=-1)
+        return CellRef.from_cell(d_cells['cell_end_cols']).offset(irows=-1)
 
 def row_col(c):
     """
@@ -230,35 +1004,173 @@ def row_col(c):
     
 def write_df_data(ws, df, d_cells):
     """
-    Write DataFrame's data values
-    JDL 4/23/23
+    Write DataFrame's data values (converted once to native columns and
+    written in row batches; text columns assigned from checked uniques)
+    JDL 4/23/23; bulk write via df_to_native_cols 10/17/26
     """
-    for i, j, c in rng_iterator_enum(ws, d_cells['cell_home_data'], d_cells['cell_end_data']):
-        c.value = df.values[i-1][j-1]        
+    row, col = row_col(d_cells['cell_home_data'])
+    lst_cols, lst_is_text = df_to_native_cols(df)
+    write_rows_to_rng(ws, row, col, zip(*lst_cols), lst_is_text=lst_is_text)
     return ws
     
 def write_df_index(ws, df, d_cells):
     """
     Write DataFrame's index to column adjacent to first data column
-    JDL 4/23/23
+    JDL 4/23/23; convert index once 10/17/26
     """
     #Write index values
-    for i, j, c in rng_iterator_enum(ws, d_cells['cell_home_idx'], d_cells['cell_end_idx']):
-        c.value = list(df.index)[i-1]
+    row, col = row_col(d_cells['cell_home_idx'])
+    vals, is_text = series_to_native_col(df.index.to_series())
+    write_rows_to_rng(ws, row, col, ([val] for val in vals), lst_is_text=[is_text])
     
     #Write index name as heading above index values
+    invalidate_value_index(ws)
     ws.cell(d_cells['cell_home_idx'].row - 1, d_cells['cell_home_idx'].column).value = df.index.name
     return ws
 
 def write_df_columns(ws, df, d_cells):
     """
     Write DataFrame's column values to row above to first data row
-    JDL 4/23/23
+    JDL 4/23/23; convert columns once 10/17/26
     """    
-    for i, j, c in rng_iterator_enum(ws, d_cells['cell_home_cols'], d_cells['cell_end_cols']):
-        c.value = list(df.columns)[j-1]  
+    row, col = row_col(d_cells['cell_home_cols'])
+    write_rows_to_rng(ws, row, col, [list(df.columns)])
+    return ws
+
+def df_to_native_rows(df):
+    """
+    Convert DataFrame values to a list of row tuples of native Python values
+    (conversion is column-wise so mixed dtypes are not upcast to object)
+    JDL 10/17/26
+    """
+    lst_cols = [series_to_native_list(df.iloc[:, j]) for j in range(df.columns.size)]
+    return list(zip(*lst_cols))
+
+def series_to_native_list(ser):
+    """
+    Return list of native Python values for a Series based on its dtype
+    (datetimes as datetime.datetime with NaT as None)
+    JDL 10/17/26
+    """
+    if pd.api.types.is_datetime64_any_dtype(ser.dtype):
+        return [None if pd.isna(v) else v.to_pydatetime() for v in ser]
+    return ser.tolist()
+
+def df_to_native_cols(df):
+    """
+    Return (list of native value lists, list of is_text flags) for df's columns
+    JDL 10/17/26
+    """
+    lst_specs = [series_to_native_col(df.iloc[:, j]) for j in range(df.columns.size)]
+    return [vals for vals, _ in lst_specs], [is_text for _, is_text in lst_specs]
+
+def series_to_native_col(ser):
+    """
+    Return (list of native values, is_text) for a Series. Categorical and 
+    object/string columns of str are factorized so each unique string is 
+    checked once and cells share the same str objects (None for missing)
+    is_text False (generic value binding) if any unique is a formula or error code
+    JDL 10/17/26
+    """
+    is_cat = isinstance(ser.dtype, pd.CategoricalDtype)
+    if not (is_cat or pd.api.types.is_object_dtype(ser.dtype) or 
+            pd.api.types.is_string_dtype(ser.dtype)):
+        return series_to_native_list(ser), False
+    codes, uniques = pd.factorize(ser, use_na_sentinel=True)
+    uniques = list(uniques)
+    if not all(type(val) is str for val in uniques): return series_to_native_list(ser), False
+    lst_text = check_text_values(uniques)
+    if lst_text is None: return series_to_native_list(ser), False
+    lst_text.append(None)
+    return [lst_text[code] for code in codes.tolist()], True
+
+def check_text_values(lst_vals):
+    """
+    Return list of strings checked as openpyxl Cell.check_string does (truncated 
+    to 32,767 characters; IllegalCharacterError if illegal characters) or None 
+    if any string would bind as a formula or error code
+    JDL 10/17/26
+    """
+    lst_text = []
+    for val in lst_vals:
+        val = val[:32767]
+        if next(ILLEGAL_CHARACTERS_RE.finditer(val), None):
+            raise IllegalCharacterError(f"{val} cannot be used in worksheets.")
+        if (len(val) > 1 and val.startswith('=')) or val in ERROR_CODES: return None
+        lst_text.append(val)
+    return lst_text
+
+def write_rows_to_rng(ws, row_home, col_home, rows, batch_rows=1000, lst_is_text=None,
+                      IsSkipNone=False):
+    """
+    Write an iterable of row sequences to ws starting at row_home, col_home
+    Rows are written in batches of batch_rows via write_row_batch
+    lst_is_text: optional per-column flags for columns of checked str or None 
+    (from series_to_native_col) to assign without openpyxl type inference
+    IsSkipNone: leave existing values of cells where the row value is None
+    JDL 10/17/26
+    """
+    invalidate_value_index(ws)
+    if lst_is_text is not None and not any(lst_is_text): lst_is_text = None
+    batch = []
+    for vals in rows:
+        batch.append(vals)
+        if len(batch) == batch_rows:
+            write_row_batch(ws, row_home, col_home, batch, lst_is_text, IsSkipNone)
+            row_home, batch = row_home + batch_rows, []
+    if len(batch) > 0: write_row_batch(ws, row_home, col_home, batch, lst_is_text, IsSkipNone)
     return ws
 
+def write_row_batch(ws, row_home, col_home, batch, lst_is_text=None, IsSkipNone=False):
+    """
+    Write a list of row sequences starting at row_home, col_home. Cells are 
+    looked up or created directly in the ws cell store (only for values present)
+    and native int and float values are set without openpyxl type inference
+    lst_is_text: optional per-column flags for columns of checked str or None
+    IsSkipNone: create cells for None values but leave their existing values 
+    (as ws.cell(row, col, value=None) does)
+    JDL 10/17/26
+    """
+    if len(batch) == 0: return ws
+    if row_home < 1 or col_home < 1 or row_home + len(batch) - 1 > 1048576:
+        raise ValueError("Row or column values out of Excel bounds")
+    for row, vals in enumerate(batch, start=row_home):
+        for col, val in enumerate(vals, start=col_home):
+            if val is None:
+                store_cell(ws, row, col, None, IsSetValue=not IsSkipNone)
+            elif lst_is_text is not None and lst_is_text[col - col_home]:
+                store_cell(ws, row, col, val, data_type='s')
+            else:
+                store_cell(ws, row, col, val)
+    return ws
+
+def store_cell(ws, row, col, val=None, style_array=None, data_type=None, IsSetValue=True):
+    """
+    Return the cell at row, col, got or created directly in ws's cell store
+    (shared by the bulk writers instead of per-cell ws.cell calls)
+    style_array: the cell's style (copied; None keeps an existing cell's style)
+    data_type: set val as already validated value of this type; otherwise native
+    int and float values are set without openpyxl type inference and other 
+    values by value binding. IsSetValue False leaves the cell's value
+    JDL 10/17/26
+    """
+    cells = ws._cells
+    c = cells.get((row, col))
+    if c is None:
+        c = Cell(ws, row=row, column=col, style_array=style_array)
+        cells[(row, col)] = c
+        if row > ws._current_row: ws._current_row = row
+    elif style_array is not None:
+        c._style = copy(style_array)
+    if not IsSetValue: return c
+    if data_type is None:
+        if not (type(val) is float or type(val) is int):
+            c.value = val
+            return c
+        data_type = 'n'
+    c._value, c.data_type = val, data_type
+    return c
+
 """ 
 ===============================================================================
 Functions for writing DataFrames with multiindex columns
@@ -286,10 +1198,11 @@ def write_df_columns_multi(ws, df, d_cells, IsMergeMatching=False):
     Write DataFrame's column values to row above to first data row (works for multiindex cols)
     JDL 3/11/24
     """    
-    n_lvls = d_cells['n_col_lvls']
+    invalidate_value_index(ws)
+    n_lvls, lst_cols = d_cells['n_col_lvls'], list(df.columns)
     for i, j, c in rng_iterator_enum(ws, d_cells['cell_home_cols'], d_cells['cell_end_cols']):
         if n_lvls == 1:
-            c.value = list(df.columns)[j-1]
+            c.value = lst_cols[j-1]
         else:
             #column label tuple
             column = df.columns[j-1]
@@ -304,13 +1217,14 @@ def write_df_columns_multi(ws, df, d_cells, IsMergeMatching=False):
                 #n_lvls = 2
                 #lvl = 1, offset(0), column[1] --> offset(-lvl + 1), column(n_lvls - lvl)
                 #lvl = 2, offset(-1), column[1]
-    if IsMergeMatching: merge_matching(ws, d_cells)
+    if IsMergeMatching: merge_matching_multiindex(ws, df, d_cells)
     return ws
 
 def merge_matching(ws, d_cells):
     """
     Merge cells with matching, adjacent multiindex column labels
-    JDL 3/11/24
+    (see merge_matching_multiindex to merge from df.columns without ws reads)
+    JDL 3/11/24; fix run start at col_home 10/17/26
     """
 
     #Set local names for column limits
@@ -322,7 +1236,7 @@ def merge_matching(ws, d_cells):
         row = d_cells['cell_home_cols'].row - lvl + 1
 
         #Initialize block of values to check and iterate
-        prev_value, start_col = None, 1
+        prev_value, start_col = None, col_home
         for col in range(col_home, col_end + 1):
             cell_value = ws.cell(row, col).value
 
@@ -337,12 +1251,55 @@ def merge_matching(ws, d_cells):
 
         #Check for sequence at the end of range
         if col_end - start_col > 0: merge_cell_sequence(ws, row, start_col, row, col_end)
+    invalidate_value_index(ws)
+
+def merge_matching_multiindex(ws, df, d_cells, IsHierarchical=False):
+    """
+    Merge cells with matching, adjacent column labels using run-length encoding
+    of df.columns codes (no worksheet reads); ranges registered in bulk
+    (single-level columns are encoded from pd.factorize codes)
+    IsHierarchical: also end runs where a higher level's label changes
+    JDL 10/17/26
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        lst_codes = [np.asarray(codes) for codes in df.columns.codes]
+    else:
+        lst_codes = [pd.factorize(df.columns)[0]]
+    n_lvls, col_home = len(lst_codes), d_cells['cell_home_cols'].column
+    row_top = d_cells['cell_home_cols'].row - n_lvls + 1
+    lst_rngs = []
+    is_break = np.zeros(df.columns.size, dtype=bool)
+    for lvl, codes in enumerate(lst_codes):
+        is_break[1:] |= codes[1:] != codes[:-1]
+        breaks = is_break if IsHierarchical else np.concatenate(([False], codes[1:] != codes[:-1]))
+        istarts = np.concatenate(([0], np.flatnonzero(breaks)))
+        iends = np.concatenate((istarts[1:] - 1, [codes.size - 1]))
+        for istart, iend in zip(istarts.tolist(), iends.tolist()):
+            if iend > istart: 
+                lst_rngs.append((row_top + lvl, col_home + istart, row_top + lvl, col_home + iend))
+    merge_cell_sequences(ws, lst_rngs)
+    return ws
+
+def merge_cell_sequences(ws, lst_rngs):
+    """
+    Merge a list of (row1, col1, row2, col2) ranges that don't overlap each other 
+    or existing merged ranges (skips openpyxl's per-range overlap check)
+    JDL 10/17/26
+    """
+    invalidate_value_index(ws)
+    for row1, col1, row2, col2 in lst_rngs:
+        mcr = MergedCellRange(ws, CellRange(min_row=row1, min_col=col1, max_row=row2, 
+                                            max_col=col2).coord)
+        ws.merged_cells.ranges.add(mcr)
+        ws._clean_merge_range(mcr)
+    return ws
 
 def merge_cell_sequence(ws, row1, col1, row2, col2):
     """
     Merge specified range
     JDL 3/11/24
     """
+    invalidate_value_index(ws)
     ws.merge_cells(start_row=row1, start_column=col1, end_row=row2, end_column=col2)
 
 """
@@ -391,7 +1348,7 @@ def set_df_cols_builtin_styles_multi(ws, d_cells, style_cols):
     row_start = d_cells['cell_home_idx'].row - d_cells['n_col_lvls']
     row_end = d_cells['cell_home_idx'].row - 1
     col = d_cells['cell_home_idx'].column
-    set_range_builtin_style(ws, ws.cell(row_start, col), ws.cell(row_end, col), style_cols)
+    set_range_builtin_style(ws, Rng(row_start, col, row_end, col), None, style_cols)
     return ws
 
 def set_df_cols_align_multi(ws, d_cells, d_align):
@@ -400,8 +1357,8 @@ def set_df_cols_align_multi(ws, d_cells, d_align):
     """
     row_start = d_cells['cell_home_idx'].row - d_cells['n_col_lvls']
     row_end = d_cells['cell_home_idx'].row - 1
-    cell_start = ws.cell(row_start, d_cells['cell_home_cols'].column)
-    cell_end = ws.cell(row_end, d_cells['cell_end_cols'].column)
+    cell_start = CellRef(row_start, d_cells['cell_home_cols'].column)
+    cell_end = CellRef(row_end, d_cells['cell_end_cols'].column)
 
     set_range_alignment(ws, cell_start, cell_end, d_align)
     return ws
@@ -410,20 +1367,191 @@ def autofit_column_width(ws, col):
     """
     Autofit the width of a column in an openpyxl worksheet.
     col is column number
-    JDL 6/18/24   
+    JDL 6/18/24; fix stored length, use autofit_columns 10/17/26
     """
-    col_letter = pyxl_util.get_column_letter(col)
-    column = ws[col_letter]
+    autofit_columns(ws, cols=[col])
+
+def autofit_columns(ws, cols=None, sample=None):
+    """
+    Autofit widths of columns (list of column numbers; default all) in one 
+    pass over the worksheet's cells. Widths are max len(str(value)) + 2
+    sample: None to scan all rows or int >= 1 to scan about that many evenly spaced rows
+    JDL 10/17/26
+    """
+    if sample is not None and sample < 1: raise ValueError("sample must be None or >= 1")
+    step = 1 if sample is None else max(1, ws.max_row // sample)
+    set_cols = None if cols is None else set(cols)
+
+    #Max text width per column (existing cells only; read-only ws via iter_rows)
+    d_widths = {}
+    for row, col, val in iter_cell_values(ws):
+        if val is None or (row - 1) % step != 0: continue
+        if set_cols is not None and col not in set_cols: continue
+        width = text_width(val)
+        if width > d_widths.get(col, 0): d_widths[col] = width
+
+    for col in (cols if cols is not None else d_widths.keys()):
+        letter = pyxl_util.get_column_letter(col)
+        ws.column_dimensions[letter].width = d_widths.get(col, 0) + 2
+    return ws
+
+def iter_cell_values(ws):
+    """
+    Generator of (row, col, value) for a worksheet's existing cells
+    JDL 10/17/26
+    """
+    cells = getattr(ws, '_cells', None)
+    if cells is not None:
+        for (row, col), c in cells.items():
+            yield row, col, c.value
+        return
+    for row in ws.iter_rows():
+        for c in row:
+            if hasattr(c, 'column'): yield c.row, c.column, c.value
+
+@lru_cache(maxsize=65536, typed=True)
+def text_width(val):
+    """
+    Return displayed text width of a cell value (memoized for repeated values)
+    JDL 10/17/26
+    """
+    return max(len(line) for line in str(val).split('\n'))
+
+def autofit_df_columns(ws, df, cell_home):
+    """
+    Autofit widths of index and data columns for a DataFrame written at cell_home
+    (widths from vectorized string lengths of df without reading ws cells)
+    JDL 10/17/26
+    """
+    col_home = cell_home.column
+    n_lvls = set_num_col_levels(df)
+    lst_idx_names = [df.index.name] if df.index.name is not None else []
+    lst_widths = [max_str_len(df.index.to_series(), lst_idx_names)]
+    for j in range(df.columns.size):
+        labels = list(df.columns[j]) if n_lvls > 1 else [df.columns[j]]
+        lst_widths.append(max_str_len(df.iloc[:, j], labels))
+
+    for i, width in enumerate(lst_widths):
+        letter = pyxl_util.get_column_letter(col_home - 1 + i)
+        ws.column_dimensions[letter].width = width + 2
+    return ws
+
+def max_str_len(ser, labels=()):
+    """
+    Return max string length of non-null Series values and labels
+    JDL 10/17/26
+    """
+    ser = ser[ser.notna()]
+    n = int(ser.astype(str).str.len().max()) if ser.size > 0 else 0
+    return max([n] + [len(str(label)) for label in labels if label is not None])
+
+""" 
+===============================================================================
+Style object cache - build each distinct style once and register it once
+per workbook; range helpers then set the cell's style array index directly
+===============================================================================
+"""
+STYLE_CACHE_MAX = 1024
+_d_style_objs = OrderedDict()
+_wd_style_ids = weakref.WeakKeyDictionary()
+d_style_cache_stats = {'hits':0, 'misses':0, 'obj_hits':0, 'obj_misses':0}
+
+#Style kind: (workbook collection, cell StyleArray attribute)
+d_style_kinds = {'border':('_borders', 'borderId'), 
+                 'alignment':('_alignments', 'alignmentId'),
+                 'num_fmt':('_number_formats', 'numFmtId')}
+
+def border_style_key(style_border):
+    """
+    Return normalized style cache key for a border style name
+    JDL 10/17/26
+    """
+    return ('border', style_border)
+
+def alignment_style_key(d_align):
+    """
+    Return normalized style cache key for a d_align dict
+    JDL 10/17/26
+    """
+    return ('alignment', d_align.get('horizontal'), d_align.get('wrap_text'))
+
+def num_fmt_style_key(num_fmt):
+    """
+    Return normalized style cache key for a number format string
+    JDL 10/17/26
+    """
+    return ('num_fmt', num_fmt)
+
+def get_cached_style_obj(key):
+    """
+    Return the shared style object for a cache key (LRU bounded at STYLE_CACHE_MAX)
+    JDL 10/17/26
+    """
+    if key in _d_style_objs:
+        d_style_cache_stats['obj_hits'] += 1
+        _d_style_objs.move_to_end(key)
+        return _d_style_objs[key]
+    d_style_cache_stats['obj_misses'] += 1
+    if key[0] == 'border':
+        obj = set_openpyxl_border_obj(key[1])
+    elif key[0] == 'alignment':
+        obj = set_openpyxl_alignment_obj({'horizontal':key[1], 'wrap_text':key[2]})
+    else:
+        obj = key[1]
+    _d_style_objs[key] = obj
+    if len(_d_style_objs) > STYLE_CACHE_MAX: _d_style_objs.popitem(last=False)
+    return obj
+
+def get_cached_style_id(wb, key):
+    """
+    Return a workbook's style table index for a cache key, registering the 
+    style object in the workbook on first use
+    JDL 10/17/26
+    """
+    d_ids = _wd_style_ids.setdefault(wb, {})
+    if key in d_ids:
+        d_style_cache_stats['hits'] += 1
+        return d_ids[key]
+    d_style_cache_stats['misses'] += 1
+    obj = get_cached_style_obj(key)
+    collection = d_style_kinds[key[0]][0]
+    if key[0] != 'num_fmt':
+        idx = getattr(wb, collection).add(obj)
+    elif obj in BUILTIN_FORMATS_REVERSE:
+        idx = BUILTIN_FORMATS_REVERSE[obj]
+    else:
+        idx = getattr(wb, collection).add(obj) + BUILTIN_FORMATS_MAX_SIZE
+    d_ids[key] = idx
+    return idx
+
+def set_cell_style_id(c, kind, idx):
+    """
+    Set a cell's style array index for style kind ('border', 'alignment', 'num_fmt')
+    JDL 10/17/26
+    """
+    if not c._style: c._style = StyleArray()
+    setattr(c._style, d_style_kinds[kind][1], idx)
+
+def get_style_cache_stats():
+    """
+    Return dict of style cache hit/miss counters and cache sizes
+    (hits/misses are per-workbook registrations; obj_ are shared object builds)
+    JDL 10/17/26
+    """
+    d_stats = dict(d_style_cache_stats)
+    d_stats['n_objs'] = len(_d_style_objs)
+    d_stats['n_wbs'] = len(_wd_style_ids)
+    return d_stats
+
+def clear_style_cache():
+    """
+    Clear cached style objects, workbook style indices and counters
+    JDL 10/17/26
+    """
+    _d_style_objs.clear()
+    _wd_style_ids.clear()
+    for key in d_style_cache_stats: d_style_cache_stats[key] = 0
 
-    #Get the max length of any cell value in the column
-    max_length = 0
-    for cell in column:
-        try:
-            if len(str(cell.value)) > max_length: max_length = len(cell.value)
-        except:
-            pass
-    adjusted_width = (max_length + 2)
-    ws.column_dimensions[col_letter].width = adjusted_width
 """ 
 ===============================================================================
 Functions for setting borders
@@ -443,14 +1571,15 @@ def set_openpyxl_border_obj(style_border):
 def set_range_border(ws, cell_home, cell_end, style_border):
     """
     Set borders for an Excel range defined by ws cell_home and cell_end
+    (or a Rng as cell_home with cell_end None)
     JDL 4/21/23
     """
-    #Create a Border object for style_border
-    border_obj = set_openpyxl_border_obj(style_border)
+    #Get workbook's index for the cached Border object for style_border
+    idx = get_cached_style_id(ws.parent, border_style_key(style_border))
     
-    #Apply the border_obj to each cell in the range
-    for c in rng_iterator(ws, cell_home, cell_end):
-        c.border = border_obj
+    #Apply the border to each cell in the range
+    for row in rng_iter_rows(ws, cell_home, cell_end):
+        for c in row: set_cell_style_id(c, 'border', idx)
         
 def set_df_borders(ws, df, cell_home):
     """
@@ -463,10 +1592,15 @@ def set_df_borders(ws, df, cell_home):
     ws = set_df_cols_borders(ws, d_cells, 'thick')
     return ws
 
-def set_df_data_borders(ws, d_cells, style_border):
+def set_df_data_borders(ws, d_cells, style_border, IsCondFmt=False):
     """
     Put border around cells for df data values
+    IsCondFmt: apply as one conditional format rule instead of per-cell styles
     """
+    if IsCondFmt:
+        set_range_style_cf(ws, d_cells['cell_home_data'], d_cells['cell_end_data'], 
+                           style_border=style_border)
+        return ws
     set_range_border(ws, d_cells['cell_home_data'], d_cells['cell_end_data'], style_border)
     return ws
 
@@ -474,7 +1608,7 @@ def set_df_index_borders(ws, d_cells, style_border):
     set_range_border(ws, d_cells['cell_home_idx'], d_cells['cell_end_idx'], style_border)
     row = d_cells['cell_home_idx'].row - 1
     col = d_cells['cell_home_idx'].column
-    set_range_border(ws, ws.cell(row, col), ws.cell(row, col), style_border)
+    set_range_border(ws, CellRef(row, col), None, style_border)
     return ws
 
 def set_df_cols_borders(ws, d_cells, style_border):
@@ -490,10 +1624,10 @@ Functions for setting built-in styles for a range or a DataFrame
 def set_range_builtin_style(ws, cell_home, cell_end, style_builtin):
     """
     Apply the builtin style to each cell in the range
-    JDL 4/25/23
+    JDL 4/25/23; use rng_iter_rows 10/17/26
     """
-    for c in rng_iterator(ws, cell_home, cell_end):
-        c.style = style_builtin
+    for row in rng_iter_rows(ws, cell_home, cell_end):
+        for c in row: c.style = style_builtin
         
 def set_df_builtin_styles(ws, df, cell_home, style_data=None, style_idx=None, style_cols=None):
     """
@@ -506,10 +1640,15 @@ def set_df_builtin_styles(ws, df, cell_home, style_data=None, style_idx=None, st
     if not style_cols is None: ws = set_df_cols_builtin_styles(ws, d_cells, style_cols)
     return ws
 
-def set_df_data_builtin_styles(ws, d_cells, style_data):
+def set_df_data_builtin_styles(ws, d_cells, style_data, IsCondFmt=False):
     """
     Set built-in Excel style for df data values
+    IsCondFmt: apply style's font, fill and border as one conditional format rule
     """
+    if IsCondFmt:
+        set_range_style_cf(ws, d_cells['cell_home_data'], d_cells['cell_end_data'], 
+                           style_builtin=style_data)
+        return ws
     set_range_builtin_style(ws, d_cells['cell_home_data'], d_cells['cell_end_data'], style_data)
     return ws
 
@@ -530,7 +1669,7 @@ def set_df_cols_builtin_styles(ws, d_cells, style_cols, fmt_idx_name=True):
     if fmt_idx_name:
         row = d_cells['cell_home_idx'].row - 1
         col = d_cells['cell_home_idx'].column
-        set_range_builtin_style(ws, ws.cell(row, col), ws.cell(row, col), style_cols)
+        set_range_builtin_style(ws, CellRef(row, col), None, style_cols)
     return ws
 
 """ 
@@ -558,13 +1697,22 @@ Functions for setting cell alignment properties
 def set_range_alignment(ws, cell_home, cell_end, d_align):
     """
     Set alignment for an Excel range defined by ws cell_home and cell_end
-    JDL 6/29/23
+    (or a Rng as cell_home with cell_end None)
+    JDL 6/29/23; use style cache 10/17/26
+    """
+    idx = get_cached_style_id(ws.parent, alignment_style_key(d_align))
+    for row in rng_iter_rows(ws, cell_home, cell_end):
+        for c in row: set_cell_style_id(c, 'alignment', idx)
+
+def set_openpyxl_alignment_obj(d_align):
+    """
+    Create an Alignment object from d_align dict ('horizontal' and 'wrap_text' keys)
+    JDL 6/29/23; split from set_range_alignment 10/17/26
     """
-    for c in rng_iterator(ws, cell_home, cell_end):
-        align = Alignment()
-        if 'horizontal' in d_align: align.horizontal = d_align['horizontal']
-        if 'wrap_text' in d_align: align.wrap_text = d_align['wrap_text']
-        c.alignment = align                                        
+    align = Alignment()
+    if 'horizontal' in d_align: align.horizontal = d_align['horizontal']
+    if 'wrap_text' in d_align: align.wrap_text = d_align['wrap_text']
+    return align
         
 def set_df_data_align(ws, d_cells, d_align):
     """
@@ -580,7 +1728,7 @@ def set_df_index_align(ws, d_cells, d_align):
     set_range_alignment(ws, d_cells['cell_home_idx'], d_cells['cell_end_idx'], d_align)
     row = d_cells['cell_home_idx'].row - 1
     col = d_cells['cell_home_idx'].column
-    set_range_alignment(ws, ws.cell(row, col), ws.cell(row, col), d_align)
+    set_range_alignment(ws, CellRef(row, col), None, d_align)
     return ws
 
 def set_df_cols_align(ws, d_cells, d_align):
@@ -594,19 +1742,1202 @@ def set_df_cols_align(ws, d_cells, d_align):
 Functions for setting number formats in openpyxl ws object
 ===============================================================================
 """
-def set_range_num_format(ws, cell_home, cell_end, 
+def set_range_num_format(ws, cell_home, cell_end=None, 
                          num_fmt='General', num_fmt_zeros='General'):
     """
     Apply Excel number format to each cell in a range
-    JDL 12/5/23
+    JDL 12/5/23; use style cache 10/17/26
     """
-    for c in rng_iterator(ws, cell_home, cell_end):
-        c.number_format = num_fmt
-        if c.value == 0: c.number_format = num_fmt_zeros
+    idx = get_cached_style_id(ws.parent, num_fmt_style_key(num_fmt))
+    idx_zeros = get_cached_style_id(ws.parent, num_fmt_style_key(num_fmt_zeros))
+    for row in rng_iter_rows(ws, cell_home, cell_end):
+        for c in row: set_cell_style_id(c, 'num_fmt', idx_zeros if c.value == 0 else idx)
+
+def set_df_num_formats(ws, df, cell_home, d_fmt_cols=None, d_fmt_dtypes=None, 
+                       num_fmt_zeros=None, num_fmt_neg=None, num_fmt_nan=None):
+    """
+    Apply number formats to a DataFrame's data cells by column and dtype rules
+    Zero, negative and NaN masks are computed with NumPy on df (not cell values)
+    and formats are applied in runs of rows with the same format
+    d_fmt_cols: dict of column label: format (takes precedence over dtype rule)
+    d_fmt_dtypes: dict of dtype kind ('float', 'int', 'bool', 'datetime', 'str'): format
+    num_fmt_zeros, num_fmt_neg, num_fmt_nan: override formats for masked values;
+    num_fmt_nan also applies to missing values (NaN, None, NaT) in non-numeric columns
+    JDL 10/17/26
+    """
+    d_fmt_cols, d_fmt_dtypes = d_fmt_cols or {}, d_fmt_dtypes or {}
+    wb, (row_home, col_home) = ws.parent, row_col(cell_home)
+    lst_overrides = [(fmt, fn) for fmt, fn in [(num_fmt_nan, pd.isna), 
+                     (num_fmt_neg, lambda a: a < 0), (num_fmt_zeros, lambda a: a == 0)]
+                     if fmt is not None]
+    for j, col_label in enumerate(df.columns):
+        ser = df.iloc[:, j]
+        fmt = d_fmt_cols.get(col_label, d_fmt_dtypes.get(dtype_kind(ser.dtype)))
+        lst_fmts = [fmt] + [fmt_override for fmt_override, _ in lst_overrides]
+        lst_ids = [None if f is None else get_cached_style_id(wb, num_fmt_style_key(f)) 
+                   for f in lst_fmts]
+
+        #Per-row code into lst_ids (nan, negative and zero masks are disjoint)
+        codes = np.zeros(ser.size, dtype=np.int8)
+        if len(lst_overrides) > 0 and pd.api.types.is_numeric_dtype(ser.dtype) \
+                                  and not pd.api.types.is_bool_dtype(ser.dtype):
+            arr = ser.to_numpy(dtype=float, na_value=np.nan)
+            with np.errstate(invalid='ignore'):
+                for k, (_, fn) in enumerate(lst_overrides, start=1):
+                    codes[fn(arr)] = k
+
+        #Non-numeric columns: only the nan override applies (first in lst_overrides)
+        elif num_fmt_nan is not None:
+            codes[ser.isna().to_numpy()] = 1
+        for irow1, irow2, code in iter_code_runs(codes):
+            if lst_ids[code] is None: continue
+            set_col_run_style_id(ws, col_home + j, row_home + irow1, row_home + irow2, 
+                                 'num_fmt', lst_ids[code])
+    return ws
+
+def dtype_kind(dtype):
+    """
+    Return dtype kind name used by set_df_num_formats rules
+    JDL 10/17/26
+    """
+    if pd.api.types.is_bool_dtype(dtype): return 'bool'
+    if pd.api.types.is_integer_dtype(dtype): return 'int'
+    if pd.api.types.is_float_dtype(dtype): return 'float'
+    if pd.api.types.is_datetime64_any_dtype(dtype): return 'datetime'
+    return 'str'
+
+def iter_code_runs(codes):
+    """
+    Generator of (start, end, code) for runs of equal values in a 1-D array
+    JDL 10/17/26
+    """
+    if codes.size == 0: return
+    istarts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    iends = np.concatenate((istarts[1:] - 1, [codes.size - 1]))
+    for istart, iend in zip(istarts.tolist(), iends.tolist()):
+        yield istart, iend, int(codes[istart])
+
+def set_col_run_style_id(ws, col, row1, row2, kind, idx):
+    """
+    Set a cached style id for cells in rows row1 to row2 of a column
+    JDL 10/17/26
+    """
+    for row_cells in iter_rows_coords(ws, row1, col, row2, col):
+        set_cell_style_id(row_cells[0], kind, idx)
+    return ws
 
 def set_cell_num_format(cell, num_format):
     """
     Set Excel cell number format
-    JDL 12/5/23
+    JDL 12/5/23; use style cache 10/17/26
+    """
+    idx = get_cached_style_id(cell.parent.parent, num_fmt_style_key(num_format))
+    set_cell_style_id(cell, 'num_fmt', idx)
+""" 
+===============================================================================
+Streaming export of a styled DataFrame with an openpyxl write_only workbook
+===============================================================================
+"""
+def write_df_write_only(sfile, df, sht='Sheet1', row_home=2, col_home=2, d_borders=None,
+                        d_styles=None, d_aligns=None, d_num_fmts=None, num_fmt_zeros=None,
+                        chunk_rows=10000):
+    """
+    Stream a styled DataFrame to a new workbook using openpyxl write_only mode
+    (peak memory is independent of row count; each row is emitted once)
+    row_home, col_home: top left data cell (index goes in col_home - 1 and column 
+    header rows above row_home; ValueError if they would be outside the sheet)
+    d_borders, d_styles, d_aligns, d_num_fmts: dicts keyed by region 'data', 'idx', 
+    'cols' with values as for set_range_border, set_range_builtin_style, 
+    set_range_alignment and set_range_num_format; num_fmt_zeros applies to data zeros
+    JDL 10/17/26
+    """
+    n_lvls = set_num_col_levels(df)
+    if col_home < 2 or row_home <= n_lvls:
+        raise ValueError("Row or column values out of Excel bounds")
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sht)
+    d_tmplt = set_write_only_region_styles(ws, d_borders, d_styles, d_aligns, 
+                                           d_num_fmts, num_fmt_zeros)
+    lst_pad = [None] * (col_home - 2)
+
+    #Blank rows above the column header rows
+    for _ in range(row_home - n_lvls - 1): ws.append([])
+
+    #Column header rows (top level first); index name goes on the bottom header row
+    for lvl in range(n_lvls):
+        labels = [col[lvl] for col in df.columns] if n_lvls > 1 else list(df.columns)
+        name = df.index.name if lvl == n_lvls - 1 else None
+        row = [write_only_cell(ws, name, d_tmplt['idx_name'])]
+        row += [write_only_cell(ws, val, d_tmplt['cols']) for val in labels]
+        ws.append(lst_pad + row)
+
+    #Index and data rows, converted to native values in chunks of chunk_rows
+    for i in range(0, df.index.size, chunk_rows):
+        df_chunk = df.iloc[i:i + chunk_rows]
+        idx_vals = series_to_native_list(df_chunk.index.to_series())
+        for idx_val, vals in zip(idx_vals, df_to_native_rows(df_chunk)):
+            row = [write_only_cell(ws, idx_val, d_tmplt['idx'])]
+            row += [write_only_cell(ws, val, d_tmplt['data_zeros'] if val == 0 
+                                    else d_tmplt['data']) for val in vals]
+            ws.append(lst_pad + row)
+    wb.save(sfile)
+    return sfile
+
+def set_write_only_region_styles(ws, d_borders, d_styles, d_aligns, d_num_fmts, num_fmt_zeros):
+    """
+    Precompute one style template per DataFrame region for write_only export
+    Index name cell follows write_dataframe helpers: idx border and alignment, cols style
+    JDL 10/17/26
+    """
+    d_borders, d_styles = d_borders or {}, d_styles or {}
+    d_aligns, d_num_fmts = d_aligns or {}, d_num_fmts or {}
+    d_tmplt = {}
+    for region in ['data', 'idx', 'cols']:
+        d_tmplt[region] = set_write_only_style(ws, d_borders.get(region), d_styles.get(region),
+                                               d_aligns.get(region), d_num_fmts.get(region))
+    d_tmplt['data_zeros'] = d_tmplt['data']
+    if num_fmt_zeros is not None:
+        d_tmplt['data_zeros'] = set_write_only_style(ws, d_borders.get('data'), 
+                                d_styles.get('data'), d_aligns.get('data'), num_fmt_zeros)
+    d_tmplt['idx_name'] = set_write_only_style(ws, d_borders.get('idx'), d_styles.get('cols'),
+                                               d_aligns.get('idx'), None)
+    return d_tmplt
+
+def set_write_only_style(ws, style_border=None, style_builtin=None, d_align=None, num_fmt=None):
+    """
+    Style a template WriteOnlyCell and return its style array (None if unstyled)
+    Built-in style is applied first since it resets the other attributes
+    JDL 10/17/26
+    """
+    c = WriteOnlyCell(ws)
+    if style_builtin is not None: c.style = style_builtin
+    if style_border is not None: c.border = set_openpyxl_border_obj(style_border)
+    if d_align is not None: c.alignment = set_openpyxl_alignment_obj(d_align)
+    if num_fmt is not None: c.number_format = num_fmt
+    return c._style
+
+def write_only_cell(ws, value, style_array):
+    """
+    Return a WriteOnlyCell with value and a precomputed style array
+    A region number format wins over dates' format (as with set_range_num_format); 
+    otherwise dates get a copy so binding the value can add a date number format
+    JDL 10/17/26
+    """
+    c = WriteOnlyCell(ws, value=value)
+    if style_array is None: return c
+    if c.data_type == 'd' and style_array.numFmtId == 0:
+        c._style = copy(style_array)
+        c.value = value
+    else:
+        c._style = style_array
+    return c
+
+""" 
+===============================================================================
+DataFrame layout plan - compute d_cells regions once, collect value, border,
+style, alignment and number format rules per region and apply them in a 
+single pass over each region's cells
+===============================================================================
+"""
+LAYOUT_REGIONS = ['data', 'idx', 'cols', 'idx_name']
+
+def create_df_layout(ws, df, cell_home):
+    """
+    Return layout plan dict for a DataFrame with top left data cell cell_home
+    Regions: 'data', 'idx', 'cols' (all column levels) and 'idx_name' (cells 
+    above index) as (row_start, col_start, row_end, col_end) tuples
+    JDL 10/17/26
+    """
+    d_cells = set_df_openpyxl_cell_locns(ws, df, cell_home)
+    d_layout = {'df':df, 'd_cells':d_cells, 'd_rules':{region:{} for region in LAYOUT_REGIONS}}
+    d_layout['d_rngs'] = {'data':d_cells.data.bounds, 'idx':d_cells.idx.bounds,
+                          'cols':d_cells.cols_rng.bounds, 'idx_name':d_cells.idx_name.bounds}
+    return d_layout
+
+def add_layout_rule(d_layout, regions, style_border=None, style_builtin=None, d_align=None,
+                    num_fmt=None, num_fmt_zeros=None):
+    """
+    Add formatting rule(s) for one region or a list of regions of a layout plan
+    (later rules for the same attribute replace earlier ones)
+    JDL 10/17/26
+    """
+    if isinstance(regions, str): regions = [regions]
+    d_new = {'style_border':style_border, 'style_builtin':style_builtin, 'd_align':d_align,
+             'num_fmt':num_fmt, 'num_fmt_zeros':num_fmt_zeros}
+    for region in regions:
+        d_layout['d_rules'][region].update({k:v for k, v in d_new.items() if v is not None})
+    return d_layout
+
+def add_layout_rules(d_layout, rules):
+    """
+    Add a list of add_layout_rule kwarg dicts (each including 'regions')
+    JDL 10/17/26
+    """
+    for d_rule in rules:
+        d_rule = dict(d_rule)
+        add_layout_rule(d_layout, d_rule.pop('regions'), **d_rule)
+    return d_layout
+
+def apply_df_layout(ws, d_layout, IsWriteValues=True, IsMergeMatching=False):
+    """
+    Write values (optional) and apply all rules of a layout plan, visiting each
+    cell once. Per cell, a built-in style is applied first, then the value (so 
+    dates keep a date format), then border, alignment and number format
+    JDL 10/17/26
+    """
+    df = d_layout['df']
+    with gc_paused():
+        for region in LAYOUT_REGIONS:
+            rows, lst_is_text = layout_region_values(df, region) if IsWriteValues else (None, None)
+            apply_layout_region(ws, d_layout['d_rngs'][region], d_layout['d_rules'][region], 
+                                rows, lst_is_text)
+    if IsMergeMatching and d_layout['d_cells']['n_col_lvls'] > 1:
+        merge_matching_multiindex(ws, df, d_layout['d_cells'])
+    return ws
+
+@contextmanager
+def gc_paused():
+    """
+    Context manager pausing cyclic garbage collection while a layout creates 
+    cells (new cells are long-lived, so collections only rescan them)
+    JDL 10/17/26
+    """
+    IsEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if IsEnabled: gc.enable()
+
+def layout_region_values(df, region):
+    """
+    Return (list of value rows, per-column is_text flags or None) for a layout 
+    region (flags from series_to_native_col for data and index values)
+    JDL 10/17/26
+    """
+    n_lvls = set_num_col_levels(df)
+    if region == 'data':
+        lst_cols, lst_is_text = df_to_native_cols(df)
+        return list(zip(*lst_cols)), lst_is_text
+    elif region == 'idx':
+        vals, is_text = series_to_native_col(df.index.to_series())
+        return [[val] for val in vals], [is_text]
+    elif region == 'cols' and n_lvls == 1:
+        return [list(df.columns)], None
+    elif region == 'cols':
+        return [[col[lvl] for col in df.columns] for lvl in range(n_lvls)], None
+    return [[None]] * (n_lvls - 1) + [[df.index.name]], None
+
+def apply_layout_region(ws, rng, d_rule, rows=None, lst_is_text=None):
+    """
+    Apply a region's rule (and values if rows is not None) in one pass over its cells
+    Values are set as by write_row_batch (native int, float and lst_is_text 
+    columns of checked str without openpyxl type inference)
+    JDL 10/17/26
+    """
+    if len(d_rule) == 0 and rows is None: return ws
+    if rows is not None: invalidate_value_index(ws)
+    row1, col1, row2, col2 = rng
+    if row1 < 1 or col1 < 1 or row2 > 1048576:
+        raise ValueError("Row or column values out of Excel bounds")
+    if lst_is_text is not None and not any(lst_is_text): lst_is_text = None
+    wb = ws.parent
+
+    #Style array for built-in style (set on the region's first cell)
+    style_base = None
+    if 'style_builtin' in d_rule:
+        c = ws.cell(row1, col1)
+        c.style = d_rule['style_builtin']
+        style_base = c._style
+
+    #Cached style ids as (StyleArray attribute, index) pairs
+    lst_ids = []
+    if 'style_border' in d_rule:
+        lst_ids.append(('borderId', get_cached_style_id(wb, border_style_key(d_rule['style_border']))))
+    if 'd_align' in d_rule:
+        lst_ids.append(('alignmentId', get_cached_style_id(wb, alignment_style_key(d_rule['d_align']))))
+    idx_fmt = idx_fmt_zeros = None
+    if 'num_fmt' in d_rule:
+        idx_fmt = get_cached_style_id(wb, num_fmt_style_key(d_rule['num_fmt']))
+    if 'num_fmt_zeros' in d_rule:
+        idx_fmt_zeros = get_cached_style_id(wb, num_fmt_style_key(d_rule['num_fmt_zeros']))
+
+    #Final style arrays (by is zero) for new cells and cells restyled from style_base
+    IsStyled = len(lst_ids) > 0 or idx_fmt is not None or idx_fmt_zeros is not None
+    d_arrays = {}
+    if IsStyled or style_base is not None:
+        for IsZero in [False, True]:
+            style_array = StyleArray(style_base) if style_base is not None else StyleArray()
+            for attr, idx in lst_ids: setattr(style_array, attr, idx)
+            idx = idx_fmt_zeros if IsZero and idx_fmt_zeros is not None else idx_fmt
+            if idx is not None: style_array.numFmtId = idx
+            d_arrays[IsZero] = style_array
+
+    cells = ws._cells
+    iter_vals = iter(rows) if rows is not None else None
+    for row in range(row1, row2 + 1):
+        vals = next(iter_vals) if iter_vals is not None else None
+        for j, col in enumerate(range(col1, col2 + 1)):
+            c = cells.get((row, col))
+            if vals is None:
+                val, data_type = (None if c is None else c.value), None
+            else:
+                val = vals[j]
+                IsText = lst_is_text is not None and val is not None and lst_is_text[j]
+                data_type = 's' if IsText else None
+
+            #Existing cells without a built-in style keep their style with rule ids set
+            if c is not None and style_base is None:
+                store_cell(ws, row, col, val, None, data_type, IsSetValue=vals is not None)
+                if not IsStyled: continue
+                if not c._style: c._style = StyleArray()
+                for attr, idx in lst_ids: setattr(c._style, attr, idx)
+                if idx_fmt_zeros is not None and val == 0:
+                    c._style.numFmtId = idx_fmt_zeros
+                elif idx_fmt is not None:
+                    c._style.numFmtId = idx_fmt
+                continue
+
+            #Binding a date value sets a date format, which the rule's format replaces
+            style_array = d_arrays[val == 0] if d_arrays else None
+            c = store_cell(ws, row, col, val, style_array, data_type, IsSetValue=vals is not None)
+            if idx_fmt is not None and c.data_type == 'd': c._style.numFmtId = idx_fmt
+    return ws
+
+""" 
+===============================================================================
+Multi-sheet report generation - each sheet's DataFrame and layout rules are
+rendered serially on the workbook or, with workers, to finished worksheet XML
+in worker processes that the parent writes into the output package
+===============================================================================
+"""
+def build_report(d_sheets, n_workers=1, wb=None, IsTemplate=False, sfile=None, 
+                 compresslevel=None):
+    """
+    Build a workbook with one sheet per entry of d_sheets {sheet name: spec}
+    spec: dict with 'df' and optional 'row_home', 'col_home' (default 2, 2),
+          'rules' (list of add_layout_rule kwarg dicts incl. 'regions'),
+          'col_widths' ({column number: width}), 'IsMergeMatching' and 'IsAutofit'
+    n_workers: 1 (default) renders serially on wb's sheets and returns wb
+               >1 or None (cpu count) renders each sheet to worksheet XML in worker
+               processes and saves wb plus the report sheets to sfile (path or 
+               binary file object; required) at compresslevel, returning sfile. 
+               The parent only registers each sheet's styles and writes its XML 
+               to the package (wb itself doesn't get the report sheets)
+    IsTemplate: render from cached layout templates (per process with workers)
+    JDL 10/17/26
+    """
+    if wb is None:
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+    if n_workers == 1:
+        render = render_sheet_from_template if IsTemplate else render_sheet_spec
+        for sht, spec in d_sheets.items(): render(wb.create_sheet(sht), spec)
+        return wb
+    if sfile is None: raise ValueError("sfile is required to build a report with workers")
+
+    #Placeholder sheets (removed after the save) whose XML is the rendered sheet XML
+    lst_wss = [wb.create_sheet(sht) for sht in d_sheets]
+    render = partial(render_sheet_xml, IsTemplate=IsTemplate, epoch=wb.epoch)
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            d_sheet_xml = {ws.title:sheet_xml_for_wb(ws, part) for ws, part 
+                           in zip(lst_wss, pool.map(render, d_sheets.values()))}
+        serialize_wb(wb, sfile, compresslevel, d_sheet_xml)
+    finally:
+        for ws in lst_wss: wb.remove(ws)
+    return sfile
+
+def render_sheet_spec(ws, spec):
+    """
+    Write and format a sheet spec's DataFrame on ws with a layout plan
+    JDL 10/17/26
+    """
+    df = spec['df']
+    cell_home = CellRef(spec.get('row_home', 2), spec.get('col_home', 2))
+    d_layout = create_df_layout(ws, df, cell_home)
+    add_layout_rules(d_layout, spec.get('rules', []))
+    apply_df_layout(ws, d_layout, IsMergeMatching=spec.get('IsMergeMatching', False))
+    set_spec_column_widths(ws, spec)
+    if spec.get('IsAutofit', False): autofit_df_columns(ws, df, cell_home)
+    return ws
+
+def render_sheet_xml(spec, IsTemplate=False, epoch=None):
+    """
+    Render a sheet spec on a scratch workbook and return its sheet XML part:
+    'xml' (worksheet XML; openpyxl writes strings inline) and 'styles' (style 
+    specs by the XML's cell style ids). Worker process entry point for build_report
+    JDL 10/17/26
+    """
+    wb = openpyxl.Workbook()
+    if epoch is not None: wb.epoch = epoch
+    ws = wb.active
+    render = render_sheet_from_template if IsTemplate else render_sheet_spec
+    render(ws, spec)
+    writer = WorksheetWriter(ws, out=BytesIO())
+    writer.write()
+    return {'xml':writer.read(), 
+            'styles':[style_array_to_spec(wb, style_array) for style_array in wb._cell_styles]}
+
+#Style id attributes of cell, row and column elements in worksheet XML
+RE_XML_STYLE_ID = re.compile(rb'(<(?:c|row) [^>]*? s="|<col [^>]*? style=")([0-9]+)"')
+
+def sheet_xml_for_wb(ws, part):
+    """
+    Return a sheet XML part's XML with its style ids remapped to those of ws's 
+    workbook (registering the part's style specs in its style table)
+    JDL 10/17/26
+    """
+    wb = ws.parent
+    lst_ids = [wb._cell_styles.add(style_spec_to_array(ws, d_style)) for d_style in part['styles']]
+    if lst_ids == list(range(len(lst_ids))): return part['xml']
+    lst_ids = [str(idx).encode() for idx in lst_ids]
+    return RE_XML_STYLE_ID.sub(lambda m: m.group(1) + lst_ids[int(m.group(2))] + b'"', part['xml'])
+
+def extract_sheet_part(ws):
+    """
+    Return picklable dict of a worksheet's cells, styles, merges and column widths
+    'cells': list of (row, col, value, data type, style index); 'styles': style specs
+    JDL 10/17/26
+    """
+    wb = ws.parent
+    d_style_idx, lst_cells = {}, []
+    for (row, col), c in ws._cells.items():
+        key = tuple(c._style) if c._style else None
+        if key is not None and key not in d_style_idx: d_style_idx[key] = len(d_style_idx)
+        if isinstance(c, MergedCell):
+            lst_cells.append((row, col, None, None, d_style_idx.get(key)))
+        else:
+            lst_cells.append((row, col, c._value, c.data_type, d_style_idx.get(key)))
+
+    lst_styles = [style_array_to_spec(wb, StyleArray(key)) for key in d_style_idx]
+    d_widths = {letter:dim.width for letter, dim in ws.column_dimensions.items() if dim.width}
+    return {'cells':lst_cells, 'styles':lst_styles, 'd_widths':d_widths,
+            'merged':[str(rng) for rng in ws.merged_cells.ranges]}
+
+def style_array_to_spec(wb, style_array):
+    """
+    Return workbook-independent dict of style objects for a cell style array
+    JDL 10/17/26
+    """
+    num_fmt_id = style_array.numFmtId
+    if num_fmt_id < BUILTIN_FORMATS_MAX_SIZE:
+        num_fmt = BUILTIN_FORMATS.get(num_fmt_id, 'General')
+    else:
+        num_fmt = wb._number_formats[num_fmt_id - BUILTIN_FORMATS_MAX_SIZE]
+    return {'style':wb._named_styles[style_array.xfId].name, 
+            'font':wb._fonts[style_array.fontId], 'fill':wb._fills[style_array.fillId],
+            'border':wb._borders[style_array.borderId], 'number_format':num_fmt,
+            'protection':wb._protections[style_array.protectionId],
+            'alignment':wb._alignments[style_array.alignmentId],
+            'quotePrefix':style_array.quotePrefix, 'pivotButton':style_array.pivotButton}
+
+def style_spec_to_array(ws, d_style):
+    """
+    Register a style spec's objects in ws's workbook and return the style array
+    JDL 10/17/26
+    """
+    c = Cell(ws)
+    c.style = d_style['style']
+    for attr in ['font', 'fill', 'border', 'number_format', 'protection', 'alignment']:
+        setattr(c, attr, d_style[attr])
+    c._style.quotePrefix, c._style.pivotButton = d_style['quotePrefix'], d_style['pivotButton']
+    return c._style
+
+""" 
+===============================================================================
+Layout templates - a sheet spec's styles (no values or merges) are rendered once
+per layout signature and cached as a sheet part; later renders create each 
+cell from the template style with its value in one pass
+===============================================================================
+"""
+TEMPLATE_CACHE_MAX = 64
+_d_templates = OrderedDict()
+d_template_cache_stats = {'hits':0, 'misses':0}
+
+#Rule attributes whose cell formats depend on cell values (re-applied on fill)
+LAYOUT_VALUE_RULES = ['num_fmt', 'num_fmt_zeros']
+
+def layout_signature(spec):
+    """
+    Return hashable layout signature of a sheet spec: df shape, column levels,
+    home cell, rules and column widths
+    JDL 10/17/26
     """
-    cell.number_format = num_format
\ No newline at end of file
+    df = spec['df']
+    return (df.shape, set_num_col_levels(df), spec.get('row_home', 2), spec.get('col_home', 2),
+            freeze_spec_value(spec.get('rules', [])), 
+            freeze_spec_value(spec.get('col_widths', {})))
+
+def freeze_spec_value(val):
+    """
+    Return hashable version of nested spec dicts and lists
+    JDL 10/17/26
+    """
+    if isinstance(val, dict):
+        return tuple(sorted((k, freeze_spec_value(v)) for k, v in val.items()))
+    if isinstance(val, (list, tuple)):
+        return tuple(freeze_spec_value(v) for v in val)
+    return val
+
+def get_layout_template(spec):
+    """
+    Return cached template for a spec's layout signature (LRU bounded at 
+    TEMPLATE_CACHE_MAX), rendering it on a scratch workbook on a miss
+    Template: sheet part of styles and widths (cells dropped once mapped) plus
+    d_istyles {region: style index if uniform else {(row, col): style index}}
+    JDL 10/17/26
+    """
+    key = layout_signature(spec)
+    if key in _d_templates:
+        d_template_cache_stats['hits'] += 1
+        _d_templates.move_to_end(key)
+        return _d_templates[key]
+    d_template_cache_stats['misses'] += 1
+
+    ws = openpyxl.Workbook().active
+    d_layout = create_df_layout(ws, spec['df'], CellRef(spec.get('row_home', 2), 
+                                                        spec.get('col_home', 2)))
+    add_layout_rules(d_layout, spec.get('rules', []))
+    apply_df_layout(ws, d_layout, IsWriteValues=False)
+    set_spec_column_widths(ws, spec)
+    part = extract_sheet_part(ws)
+    d_cell_istyles = {(row, col):istyle for row, col, _, _, istyle in part.pop('cells')}
+    d_istyles = {}
+    for region, (row1, col1, row2, col2) in d_layout['d_rngs'].items():
+        d_rng = {(row, col):d_cell_istyles.get((row, col)) for row in range(row1, row2 + 1)
+                 for col in range(col1, col2 + 1)}
+        set_istyles = set(d_rng.values())
+        d_istyles[region] = set_istyles.pop() if len(set_istyles) == 1 else d_rng
+    template = {'part':part, 'd_rules':d_layout['d_rules'], 'd_istyles':d_istyles}
+    _d_templates[key] = template
+    if len(_d_templates) > TEMPLATE_CACHE_MAX: _d_templates.popitem(last=False)
+    return template
+
+def render_sheet_from_template(ws, spec):
+    """
+    Render a sheet spec on ws from its cached layout template (same result as 
+    render_sheet_spec). Per cell, the template style is set, then the value, 
+    then value-dependent number formats; merges and autofit follow
+    JDL 10/17/26
+    """
+    df, template = spec['df'], get_layout_template(spec)
+    cell_home = CellRef(spec.get('row_home', 2), spec.get('col_home', 2))
+    d_layout = create_df_layout(ws, df, cell_home)
+    lst_arrays = [style_spec_to_array(ws, d_style) for d_style in template['part']['styles']]
+    with gc_paused():
+        for region in LAYOUT_REGIONS:
+            rows, lst_is_text = layout_region_values(df, region)
+            fill_template_region(ws, d_layout['d_rngs'][region], rows, 
+                                 template['d_istyles'][region], lst_arrays, 
+                                 template['d_rules'][region], lst_is_text)
+    if spec.get('IsMergeMatching', False) and d_layout['d_cells']['n_col_lvls'] > 1:
+        merge_matching_multiindex(ws, df, d_layout['d_cells'])
+    for letter, width in template['part']['d_widths'].items():
+        ws.column_dimensions[letter].width = width
+    if spec.get('IsAutofit', False): autofit_df_columns(ws, df, cell_home)
+    return ws
+
+def fill_template_region(ws, rng, rows, istyles, lst_arrays, d_rule, lst_is_text=None):
+    """
+    Create (or restyle) a region's cells with template style arrays and values
+    istyles: region's style index (None for default) or {(row, col): style index}
+    Native int and float values and lst_is_text columns of checked str are set 
+    without openpyxl type inference
+    JDL 10/17/26
+    """
+    invalidate_value_index(ws)
+    if lst_is_text is not None and not any(lst_is_text): lst_is_text = None
+    wb = ws.parent
+    idx_fmt = idx_fmt_zeros = None
+    if 'num_fmt' in d_rule:
+        idx_fmt = get_cached_style_id(wb, num_fmt_style_key(d_rule['num_fmt']))
+    if 'num_fmt_zeros' in d_rule:
+        idx_fmt_zeros = get_cached_style_id(wb, num_fmt_style_key(d_rule['num_fmt_zeros']))
+
+    #Style arrays (non-zero, zero value) by style index with value rules' number formats
+    row1, col1, row2, col2 = rng
+    d_istyles = istyles if isinstance(istyles, dict) else None
+    d_pairs = {}
+    for istyle in (set(d_istyles.values()) if d_istyles is not None else {istyles}):
+        lst_pair = []
+        for IsZero in [False, True]:
+            style_array = lst_arrays[istyle] if istyle is not None else None
+            idx = idx_fmt_zeros if IsZero and idx_fmt_zeros is not None else idx_fmt
+            if idx is not None:
+                style_array = StyleArray(style_array) if style_array is not None else StyleArray()
+                style_array.numFmtId = idx
+            lst_pair.append(style_array)
+        d_pairs[istyle] = tuple(lst_pair)
+
+    #Binding a date value sets a date format, which the rule's format replaces
+    pair = d_pairs.get(istyles) if d_istyles is None else None
+    for row, vals in zip(range(row1, row2 + 1), rows):
+        for j, col in enumerate(range(col1, col2 + 1)):
+            val = vals[j]
+            if d_istyles is not None: pair = d_pairs[d_istyles[(row, col)]]
+            IsText = lst_is_text is not None and val is not None and lst_is_text[j]
+            c = store_cell(ws, row, col, val, pair[val == 0], 's' if IsText else None)
+            if idx_fmt is not None and c.data_type == 'd': c._style.numFmtId = idx_fmt
+    return ws
+
+def set_spec_column_widths(ws, spec):
+    """
+    Set a sheet spec's fixed 'col_widths' {column number: width}
+    JDL 10/17/26
+    """
+    for col, width in spec.get('col_widths', {}).items():
+        set_range_column_widths(ws, col, col, width)
+    return ws
+
+def get_template_cache_stats():
+    """
+    Return dict of layout template cache hit/miss counters and size
+    JDL 10/17/26
+    """
+    return dict(d_template_cache_stats, n_templates=len(_d_templates))
+
+def clear_template_cache():
+    """
+    Clear cached layout templates and counters
+    JDL 10/17/26
+    """
+    _d_templates.clear()
+    for key in d_template_cache_stats: d_template_cache_stats[key] = 0
+
+""" 
+===============================================================================
+Incremental refresh of a previously written DataFrame - write only changed
+cells and restyle only the rows they are in
+===============================================================================
+"""
+def update_dataframe(ws, df, cell_home, row_hashes=None, rules=None):
+    """
+    Update a DataFrame previously written at cell_home with write_dataframe (or
+    a layout plan), writing only data and index cells whose values changed
+    row_hashes: hashes returned by a previous update (rows with equal hashes are
+                skipped without reading cells); None compares every row
+    rules: list of add_layout_rule kwarg dicts reapplied to changed rows
+    Returns summary dict: 'IsFullWrite', 'n_cells_changed', 'rows_changed' 
+    (0-based df row positions) and 'row_hashes' for the next update
+    Falls back to write_dataframe if column labels or row count changed (header
+    labels are re-merged if the previous header had merged cells)
+    JDL 10/17/26
+    """
+    d_layout = create_df_layout(ws, df, cell_home)
+    add_layout_rules(d_layout, rules or [])
+    hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    d_summary = {'IsFullWrite':False, 'n_cells_changed':0, 'rows_changed':[], 
+                 'row_hashes':hashes}
+
+    #Full write (replacing the previous table's extent) if layout changed
+    if not is_same_df_layout(ws, df, d_layout, row_hashes):
+        row1, col1, row2, col2 = prev_df_extent(ws, d_layout)
+        IsMerged = len(merged_anchor_map(ws, row1, col1, row2, col2)) > 0
+        clear_rng_bulk(ws, row1, col1, row2, col2)
+        apply_df_layout(ws, d_layout, IsMergeMatching=IsMerged)
+        d_summary.update({'IsFullWrite':True, 'n_cells_changed':df.size + df.index.size,
+                          'rows_changed':list(range(df.index.size))})
+        return d_summary
+
+    #Candidate rows (hash changed or no stored hashes)
+    if row_hashes is None:
+        irows = range(df.index.size)
+    else:
+        irows = (hashes != row_hashes).nonzero()[0].tolist()
+    if len(irows) == 0: return d_summary
+
+    #Compare values of candidate rows (index in column 0) and write changes
+    invalidate_value_index(ws)
+    row_home, col_idx = d_layout['d_rngs']['idx'][:2]
+    df_rows = df.iloc[irows]
+    idx_vals = series_to_native_list(df_rows.index.to_series())
+    for irow, idx_val, vals in zip(irows, idx_vals, df_to_native_rows(df_rows)):
+        row = row_home + irow
+        n_changed = 0
+        for j, val in enumerate((idx_val,) + tuple(vals)):
+            c = ws._cells.get((row, col_idx + j))
+            if is_same_value(None if c is None else c.value, val): continue
+            ws.cell(row, col_idx + j).value = val
+            n_changed += 1
+        if n_changed == 0: continue
+        d_summary['n_cells_changed'] += n_changed
+        d_summary['rows_changed'].append(irow)
+        restyle_layout_row(ws, d_layout, row)
+    return d_summary
+
+def is_same_df_layout(ws, df, d_layout, row_hashes):
+    """
+    Return True if ws has df's column labels at its column header cells, no
+    values right of the header or below the index, and row_hashes (if any)
+    has df's row count
+    JDL 10/17/26
+    """
+    if row_hashes is not None and len(row_hashes) != df.index.size: return False
+    row_start, col_start, row_end, col_end = d_layout['d_rngs']['cols']
+    _, col_idx, row_idx_end, _ = d_layout['d_rngs']['idx']
+    for row, col in [(row_end, col_end + 1), (row_idx_end + 1, col_idx)]:
+        c = ws._cells.get((row, col))
+        if c is not None and c.value is not None: return False
+
+    d_anchors = merged_anchor_map(ws, row_start, col_start, row_end, col_end)
+    lst_vals = [[merged_cell_value(ws, row, col, d_anchors) for col in range(col_start, col_end + 1)]
+                for row in range(row_start, row_end + 1)]
+    return lst_vals == layout_region_values(df, 'cols')[0]
+
+def merged_anchor_map(ws, row1, col1, row2, col2):
+    """
+    Return dict of (row, col): (anchor row, anchor col) for cells of merged ranges 
+    that intersect a range (anchor is the merged range's top left cell)
+    JDL 10/17/26
+    """
+    d_anchors = {}
+    for mcr in ws.merged_cells.ranges:
+        if mcr.max_row < row1 or mcr.min_row > row2 or mcr.max_col < col1 or mcr.min_col > col2:
+            continue
+        for row in range(mcr.min_row, mcr.max_row + 1):
+            for col in range(mcr.min_col, mcr.max_col + 1):
+                d_anchors[(row, col)] = (mcr.min_row, mcr.min_col)
+    return d_anchors
+
+def merged_cell_value(ws, row, col, d_anchors):
+    """
+    Return value of an existing cell (None if absent), read from its merged 
+    range's anchor cell if it is in d_anchors
+    JDL 10/17/26
+    """
+    c = ws._cells.get(d_anchors.get((row, col), (row, col)))
+    return None if c is None else c.value
+
+def prev_df_extent(ws, d_layout):
+    """
+    Return (row1, col1, row2, col2) extent of a table previously written at the
+    layout's location, ending at the last contiguous non-empty index and 
+    bottom column header cells
+    JDL 10/17/26
+    """
+    row_start, col_idx, _, _ = d_layout['d_rngs']['idx_name']
+    row_hdr, row, col = d_layout['d_rngs']['cols'][2], d_layout['d_rngs']['data'][0], col_idx + 1
+    d_anchors = merged_anchor_map(ws, row_hdr, col, row_hdr, 16384)
+    while ws._cells.get((row, col_idx)) is not None and ws._cells[(row, col_idx)].value is not None:
+        row += 1
+    while merged_cell_value(ws, row_hdr, col, d_anchors) is not None:
+        col += 1
+    return row_start, col_idx, max(row - 1, row_hdr), max(col - 1, col_idx)
+
+def is_same_value(val_cell, val):
+    """
+    Return True if a cell value equals a native DataFrame value (NaN equals NaN)
+    JDL 10/17/26
+    """
+    if val_cell == val: return True
+    return isinstance(val, float) and isinstance(val_cell, float) and val != val and val_cell != val_cell
+
+def restyle_layout_row(ws, d_layout, row):
+    """
+    Reapply a layout plan's 'data' and 'idx' rules to one worksheet row
+    JDL 10/17/26
+    """
+    for region in ['data', 'idx']:
+        _, col_start, _, col_end = d_layout['d_rngs'][region]
+        apply_layout_region(ws, (row, col_start, row, col_end), d_layout['d_rules'][region])
+    return ws
+
+""" 
+===============================================================================
+Region styles as worksheet-level conditional format rules - one rule per
+region instead of a style reference per cell (file size and save time don't
+grow with row count; alignment is not supported by conditional formats)
+===============================================================================
+"""
+def set_range_style_cf(ws, cell_home, cell_end=None, style_border=None, style_builtin=None,
+                       fill_color=None, formula='TRUE'):
+    """
+    Apply a uniform style to a range as one conditional format rule
+    style_builtin: built-in style name whose font, fill and border are used
+    style_border, fill_color (hex RGB): override/add border and solid fill
+    formula: rule formula (default TRUE applies to every cell)
+    JDL 10/17/26
+    """
+    font = fill = border = None
+    if style_builtin is not None:
+        named_style = builtin_named_styles[style_builtin]
+        font, border = named_style.font, named_style.border
+        fill = PatternFill(fill_type=named_style.fill.fill_type, fgColor=named_style.fill.fgColor, 
+                           bgColor=named_style.fill.fgColor)
+    if style_border is not None: border = set_openpyxl_border_obj(style_border)
+    if fill_color is not None: fill = set_solid_fill_obj(fill_color)
+    rule = FormulaRule(formula=[formula], font=font, fill=fill, border=border)
+    ws.conditional_formatting.add(rng_coord(cell_home, cell_end), rule)
+    return ws
+
+def set_range_banded_rows_cf(ws, cell_home, cell_end=None, fill_color='DDEBF7', n_rows_band=1):
+    """
+    Shade alternating bands of n_rows_band rows in a range (starting with the 
+    second band) with one conditional format formula rule
+    JDL 10/17/26
+    """
+    formula = 'MOD(INT((ROW()-{0})/{1}),2)=1'.format(rng_bounds(cell_home)[0], n_rows_band)
+    return set_range_style_cf(ws, cell_home, cell_end, fill_color=fill_color, formula=formula)
+
+def set_solid_fill_obj(fill_color):
+    """
+    Create a solid PatternFill for a hex RGB color (conditional formats use bgColor)
+    JDL 10/17/26
+    """
+    return PatternFill(fill_type='solid', start_color=fill_color, end_color=fill_color, 
+                       bgColor=fill_color)
+
+def rng_coord(cell_home, cell_end=None):
+    """
+    Return A1-style range string for home and end cells (or a Rng)
+    JDL 10/17/26
+    """
+    row1, col1, row2, col2 = rng_bounds(cell_home, cell_end)
+    return CellRange(min_row=row1, min_col=col1, max_row=row2, max_col=col2).coord
+
+""" 
+===============================================================================
+Opt-in instrumentation - while enabled, helpers are replaced in the module 
+namespace by wrappers recording call counts, wall time and cells touched 
+(no overhead when disabled; module-internal calls are instrumented but names
+imported elsewhere with "from util_openpyxl import ..." are not)
+===============================================================================
+"""
+#Helper name: function(args) returning number of cells touched
+d_instrument_cells = {
+    'write_df_data':lambda ws, df, d_cells, *a, **k: df.size,
+    'write_df_index':lambda ws, df, d_cells, *a, **k: df.index.size + 1,
+    'write_df_columns':lambda ws, df, d_cells, *a, **k: df.columns.size,
+    'write_df_columns_multi':lambda ws, df, d_cells, *a, **k: df.columns.size * d_cells['n_col_lvls'],
+    'set_range_border':lambda ws, cell_home, cell_end=None, *a, **k: 
+        n_rng_cells(cell_home, cell_end),
+    'set_range_alignment':lambda ws, cell_home, cell_end=None, *a, **k: 
+        n_rng_cells(cell_home, cell_end),
+    'set_range_num_format':lambda ws, cell_home, cell_end=None, *a, **k: 
+        n_rng_cells(cell_home, cell_end),
+    'set_range_builtin_style':lambda ws, cell_home, cell_end=None, *a, **k: 
+        n_rng_cells(cell_home, cell_end),
+    'set_df_num_formats':lambda ws, df, cell_home, *a, **k: df.size,
+    'merge_matching':lambda ws, d_cells, *a, **k: 
+        n_rng_cells(d_cells['cell_cols_rng_begin'], d_cells['cell_end_cols']),
+    'merge_matching_multiindex':lambda ws, df, d_cells, *a, **k: 
+        df.columns.size * d_cells['n_col_lvls'],
+    'apply_df_layout':lambda ws, d_layout, *a, **k: 
+        sum(n_rng_cells(*rng) for rng in d_layout['d_rngs'].values()),
+    'save_wb':lambda wb, *a, **k: sum(len(getattr(ws, '_cells', ())) for ws in wb.worksheets)}
+
+d_instrument_stats = {}
+_d_uninstrumented = {}
+
+def n_rng_cells(*args):
+    """
+    Return cell count for (cell_home, cell_end), (Rng,) or (row1, col1, row2, col2)
+    JDL 10/17/26
+    """
+    if len(args) <= 2: args = rng_bounds(*args)
+    row1, col1, row2, col2 = args
+    return max(row2 - row1 + 1, 0) * max(col2 - col1 + 1, 0)
+
+def enable_instrumentation(callback=None, lst_fns=None):
+    """
+    Replace helpers (default all in d_instrument_cells) with instrumented wrappers
+    callback: optional fn(name, seconds, n_cells) called after each helper call
+    JDL 10/17/26
+    """
+    for name in (lst_fns or d_instrument_cells):
+        if name in _d_uninstrumented: continue
+        _d_uninstrumented[name] = globals()[name]
+        globals()[name] = instrument_fn(name, _d_uninstrumented[name], callback)
+
+def disable_instrumentation():
+    """
+    Restore uninstrumented helpers (recorded stats are kept)
+    JDL 10/17/26
+    """
+    for name, fn in _d_uninstrumented.items(): globals()[name] = fn
+    _d_uninstrumented.clear()
+
+def instrument_fn(name, fn, callback=None):
+    """
+    Return wrapper of fn that records calls, seconds and cells in d_instrument_stats
+    (nested calls to instrumented helpers are included in the caller's seconds)
+    JDL 10/17/26
+    """
+    fn_cells = d_instrument_cells.get(name)
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        seconds = time.perf_counter() - t0
+        n_cells = fn_cells(*args, **kwargs) if fn_cells is not None else 0
+        d_stats = d_instrument_stats.setdefault(name, {'calls':0, 'seconds':0.0, 'cells':0})
+        d_stats['calls'] += 1
+        d_stats['seconds'] += seconds
+        d_stats['cells'] += n_cells
+        if callback is not None: callback(name, seconds, n_cells)
+        return result
+    return wrapper
+
+@contextmanager
+def instrumented(callback=None, lst_fns=None, IsReset=True):
+    """
+    Context manager enabling instrumentation; yields d_instrument_stats dict of 
+    helper name: {'calls', 'seconds', 'cells'}
+    Usage: with instrumented() as d_stats: ...
+    JDL 10/17/26
+    """
+    if IsReset: d_instrument_stats.clear()
+    enable_instrumentation(callback, lst_fns)
+    try:
+        yield d_instrument_stats
+    finally:
+        disable_instrumentation()
+
+""" 
+===============================================================================
+Direct XML writer - write a DataFrame dump as sheet XML straight into a new 
+xlsx zip from column arrays (no openpyxl Cell objects). Strings go in a shared
+strings table built with pd.factorize; styles come from a fixed table
+===============================================================================
+"""
+XL_EPOCH = np.datetime64('1899-12-30')
+
+#Fixed cellXfs style ids: regions follow set_df_borders (cols thick; idx, data thin)
+d_xml_style_ids = {'default':0, 'cols':1, 'idx':2, 'data':3, 'data_date':4, 'idx_date':5, 
+                   'date':6}
+
+def write_df_xlsx_fast(sfile, df, sht='Sheet1', is_index=False, IsBorders=False, 
+                       chunk_rows=10000, compresslevel=None):
+    """
+    Write DataFrame to a new single-sheet xlsx file by generating sheet XML directly
+    Layout matches write_df_as_wb_sht: column header row(s) then data rows, with the
+    index in column A if is_index; multiindex columns give one header row per level
+    IsBorders: thick column header and thin index/data borders as in set_df_borders
+    Missing values (NaN, None, NaT) are written as empty cells
+    JDL 10/17/26
+    """
+    n_lvls = set_num_col_levels(df)
+    df_out = df.reset_index() if is_index else df
+    n_idx_cols = df_out.columns.size - df.columns.size
+
+    #Header rows; index name(s) on the bottom header row
+    lst_hdr = []
+    for lvl in range(n_lvls):
+        row = [None] * n_idx_cols if lvl < n_lvls - 1 else list(df.index.names[:n_idx_cols])
+        row += [col[lvl] for col in df.columns] if n_lvls > 1 else list(df.columns)
+        lst_hdr.append(row)
+
+    #Shared strings from header labels and factorized text columns
+    d_sst = {}
+    lst_col_specs = [xml_col_spec(df_out.iloc[:, j], d_sst, j < n_idx_cols) 
+                     for j in range(df_out.columns.size)]
+    lst_hdr = [[xml_label_cell(val, d_sst) for val in row] for row in lst_hdr]
+
+    with ZipFile(sfile, 'w', compression=ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as f:
+            f.write(XML_SHEET_HEAD.encode())
+            f.write(xml_header_rows(lst_hdr, IsBorders).encode())
+            for irow in range(0, df_out.index.size, chunk_rows):
+                f.write(xml_data_rows(lst_col_specs, irow, min(irow + chunk_rows, df_out.index.size),
+                                      n_lvls + 1, IsBorders).encode())
+            f.write(b'</sheetData></worksheet>')
+        zf.writestr('xl/sharedStrings.xml', xml_shared_strings(d_sst))
+        zf.writestr('xl/styles.xml', XML_STYLES)
+        zf.writestr('xl/workbook.xml', XML_WORKBOOK.format(sheet=xml_escape(sht, {'"':'&quot;'})))
+        zf.writestr('xl/_rels/workbook.xml.rels', XML_WORKBOOK_RELS)
+        zf.writestr('_rels/.rels', XML_RELS)
+        zf.writestr('[Content_Types].xml', XML_CONTENT_TYPES)
+    return sfile
+
+def xml_col_spec(ser, d_sst, is_idx):
+    """
+    Return (cell type, list of cell value strings or None, style key) for a column
+    Text columns are factorized so each unique string is escaped and added once
+    Columns with non-str values (e.g. mixed object) have cell type 'mixed' and a 
+    list of per-value (cell type, value string, style key) or None
+    JDL 10/17/26
+    """
+    region = 'idx' if is_idx else 'data'
+    dtype = ser.dtype
+    if pd.api.types.is_bool_dtype(dtype) and not ser.isna().any():
+        return ('b', ['1' if v else '0' for v in ser.tolist()], region)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        arr = ser.dt.tz_localize(None).to_numpy() if getattr(ser.dt, 'tz', None) else ser.to_numpy()
+        serial = (arr - XL_EPOCH) / np.timedelta64(1, 'D')
+        return ('n', [None if v != v else repr(v) for v in serial.tolist()], region + '_date')
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        arr = ser.to_numpy(dtype=float, na_value=np.nan)
+        is_ok = np.isfinite(arr)
+        vals = ser.tolist()
+        return ('n', [repr(v) if ok else None for v, ok in zip(vals, is_ok.tolist())], region)
+
+    #Text (object, string, categorical of str): shared string index per unique value
+    codes, uniques = pd.factorize(ser, use_na_sentinel=True)
+    if all(type(val) is str for val in uniques):
+        lst_sst_ids = [str(sst_index(d_sst, val)) for val in uniques]
+        return ('s', [None if code < 0 else lst_sst_ids[code] for code in codes.tolist()], region)
+
+    #Mixed types: typed cell per value (not factorized since 1 == 1.0 == True)
+    return ('mixed', [xml_value_cell(val, d_sst, region) for val in ser.tolist()], region)
+
+def xml_value_cell(val, d_sst, region):
+    """
+    Return (cell type, value string, style key) for a single value as openpyxl
+    would write it (number, bool, date or shared string) or None if missing
+    JDL 10/17/26
+    """
+    if is_missing_value(val): return None
+    if isinstance(val, (bool, np.bool_)): return ('b', '1' if val else '0', region)
+    if isinstance(val, (int, np.integer)): return ('n', str(int(val)), region)
+    if isinstance(val, (float, np.floating)):
+        return ('n', repr(float(val)), region) if np.isfinite(val) else None
+    if isinstance(val, (date, np.datetime64)):
+        ts = pd.Timestamp(val)
+        if ts.tz is not None: ts = ts.tz_localize(None)
+        serial = float((ts.to_datetime64() - XL_EPOCH) / np.timedelta64(1, 'D'))
+        return ('n', repr(serial), region + '_date')
+    return ('s', str(sst_index(d_sst, str(val))), region)
+
+def sst_index(d_sst, text):
+    """
+    Return shared string index for text, adding it to d_sst if new
+    JDL 10/17/26
+    """
+    idx = d_sst.get(text)
+    if idx is None: idx = d_sst[text] = len(d_sst)
+    return idx
+
+def xml_label_cell(val, d_sst):
+    """
+    Return (cell type, value string) for a header label (None for empty)
+    JDL 10/17/26
+    """
+    if val is None or (isinstance(val, float) and val != val): return None
+    if isinstance(val, (int, float)) and not isinstance(val, bool): return ('n', repr(val))
+    return ('s', str(sst_index(d_sst, str(val))))
+
+def xml_header_rows(lst_hdr, IsBorders):
+    """
+    Return sheet XML for column header rows
+    JDL 10/17/26
+    """
+    style = xml_style_id('cols', IsBorders)
+    lst_rows = []
+    for irow, row in enumerate(lst_hdr, start=1):
+        cells = ''.join('<c r="{0}{1}"{2} s="{3}"><v>{4}</v></c>'.format(xml_col_letter(j), irow, 
+                        ' t="s"' if cell[0] == 's' else '', style, cell[1]) 
+                        for j, cell in enumerate(row) if cell is not None)
+        lst_rows.append('<row r="{0}">{1}</row>'.format(irow, cells))
+    return ''.join(lst_rows)
+
+def xml_data_rows(lst_col_specs, irow1, irow2, row_home, IsBorders):
+    """
+    Return sheet XML for data rows irow1 to irow2 - 1 (worksheet row row_home + irow)
+    Cell strings are built column-wise and joined per row
+    JDL 10/17/26
+    """
+    rows = [str(row_home + i) for i in range(irow1, irow2)]
+    lst_cols = []
+    for j, (cell_type, vals, style_key) in enumerate(lst_col_specs):
+        prefix = '<c r="' + xml_col_letter(j)
+        if cell_type == 'mixed':
+            lst_cols.append([prefix + row + xml_cell_suffix(cell[0], xml_style_id(cell[2], IsBorders))
+                             + cell[1] + '</v></c>' if cell is not None else ''
+                             for row, cell in zip(rows, vals[irow1:irow2])])
+            continue
+        suffix = xml_cell_suffix(cell_type, xml_style_id(style_key, IsBorders))
+        lst_cols.append([prefix + row + suffix + val + '</v></c>' if val is not None else ''
+                         for row, val in zip(rows, vals[irow1:irow2])])
+    return ''.join('<row r="' + row + '">' + ''.join(cells) + '</row>' 
+                   for row, cells in zip(rows, zip(*lst_cols)))
+
+@lru_cache(maxsize=64)
+def xml_cell_suffix(cell_type, style):
+    """
+    Return the cell XML between the cell reference and the value
+    JDL 10/17/26
+    """
+    return '"{0} s="{1}"><v>'.format('' if cell_type == 'n' else ' t="' + cell_type + '"', style)
+
+def xml_style_id(style_key, IsBorders):
+    """
+    Return cellXfs style id for a region style key (dates keep their format unbordered)
+    JDL 10/17/26
+    """
+    if IsBorders: return d_xml_style_ids[style_key]
+    return d_xml_style_ids['date'] if style_key.endswith('_date') else 0
+
+@lru_cache(maxsize=16384)
+def xml_col_letter(j):
+    """
+    Return Excel column letter for 0-based column position j
+    JDL 10/17/26
+    """
+    return pyxl_util.get_column_letter(j + 1)
+
+def xml_shared_strings(d_sst):
+    """
+    Return sharedStrings.xml for dict of text: index (insertion ordered)
+    JDL 10/17/26
+    """
+    items = ''.join('<si><t xml:space="preserve">' + xml_escape(ILLEGAL_CHARACTERS_RE.sub('', text))
+                    + '</t></si>' 
+                    for text in d_sst)
+    return XML_SST.format(n=len(d_sst), items=items)
+
+XML_SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+XML_SST = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="{n}" '
+    'uniqueCount="{n}">{items}</sst>')
+XML_STYLES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd h:mm:ss"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="3"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thick"/><right style="thick"/><top style="thick"/><bottom style="thick"/>'
+    '<diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/>'
+    '<diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="7"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="2" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="2" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="2" xfId="0" applyNumberFormat="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="2" xfId="0" applyNumberFormat="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs><cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>')
+XML_WORKBOOK = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+XML_WORKBOOK_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/sharedStrings" Target="sharedStrings.xml"/></Relationships>')
+XML_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+XML_CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>')